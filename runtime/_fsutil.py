@@ -0,0 +1,14 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Set
+
+# Directories already created/confirmed by this process.
+_ENSURED_DIRS: Set[Path] = set()
+
+
+def ensure_dir(p: Path) -> None:
+    """mkdir -p, at most once per process per directory."""
+    if p in _ENSURED_DIRS:
+        return
+    p.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(p)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+import json
+import math
+from typing import Any, Callable, Union
+
+# orjson when installed (pip install "sg-curriculum[fast]"), stdlib otherwise.
+# Both backends follow one policy, so a row reads back the same either way:
+# - dumps returns str so results can go straight into TEXT columns; non-finite
+#   floats become null (SQLite's JSON functions reject NaN/Infinity), non-str
+#   keys are stringified as json.dumps does, and ints of any size stay exact.
+# - loads accepts and returns exactly what json.loads does.
+
+
+def _nonfinite_to_none(obj: Any) -> Any:
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _nonfinite_to_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_nonfinite_to_none(v) for v in obj]
+    return obj
+
+
+def _std_dumps(obj: Any) -> str:
+    try:
+        return json.dumps(obj, allow_nan=False)
+    except ValueError:  # NaN/Infinity somewhere: rare, so only then walk the tree
+        return json.dumps(_nonfinite_to_none(obj), allow_nan=False)
+
+
+dumps: Callable[[Any], str]
+loads: Callable[[Union[str, bytes]], Any]
+try:
+    import orjson
+
+    # orjson.loads turns ints past the 64-bit range into floats, so any run of
+    # 19+ digits goes to json.loads instead (a false hit only costs speed).
+    # translate+find: much cheaper than a [0-9]{19} regex on digit-heavy JSON.
+    _DIGIT_MASK = bytes(48 if 48 <= i <= 57 else 32 for i in range(256))
+    _LONG_RUN = b"0" * 19
+
+    def dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:  # ints past 64 bits; anything else json.dumps rejects too
+            return _std_dumps(obj)
+
+    def loads(s: Union[str, bytes]) -> Any:
+        b = s.encode("utf-8", "replace") if isinstance(s, str) else s
+        if _LONG_RUN not in b.translate(_DIGIT_MASK):
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass  # NaN, a BOM, UTF-16, ...: json.loads accepts or rejects it
+        return json.loads(s)
+except ImportError:
+    dumps = _std_dumps
+    loads = json.loads
@@ -1,23 +1,62 @@
+# sg-curriculum runtime
 from __future__ import annotations
 import hashlib
+import os
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO, Tuple
+
+from ._fsutil import ensure_dir
+
+_CHUNK = 1 << 20
 
 
 def sha256_bytes(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
 
+def sha256_stream(fp: BinaryIO) -> str:
+    """
+    SHA-256 of a binary file object, read in chunks (never held in memory).
+    hashlib is backed by OpenSSL, which uses the SHA-NI kernel where the CPU has it.
+    """
+    if hasattr(hashlib, "file_digest"):  # Python 3.11+
+        return hashlib.file_digest(fp, "sha256").hexdigest()
+    h = hashlib.sha256()
+    for chunk in iter(lambda: fp.read(_CHUNK), b""):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def _blob_path(data_dir: Path, sha: str, ext: str) -> Path:
+    adir = data_dir / "attachments"
+    ensure_dir(adir)
+    safe_ext = ext.lstrip(".") or "bin"
+    return adir / f"{sha}.{safe_ext}"
+
+
 def put_blob(data_dir: Path, blob: bytes, ext: str) -> Tuple[str, Path]:
     """
     Stores blob under: data/attachments/<sha256>.<ext>
     Returns (sha256, path)
     """
     sha = sha256_bytes(blob)
-    adir = data_dir / "attachments"
-    adir.mkdir(parents=True, exist_ok=True)
-    safe_ext = ext.lstrip(".") or "bin"
-    path = adir / f"{sha}.{safe_ext}"
+    path = _blob_path(data_dir, sha, ext)
     if not path.exists():
         path.write_bytes(blob)
     return sha, path
+
+
+def put_blob_path(data_dir: Path, src_path: Path, ext: str) -> Tuple[str, Path]:
+    """
+    Like put_blob, for large files already on disk: src_path is hashed by
+    streaming and moved (not copied) into data/attachments/<sha256>.<ext>.
+    src_path must be on the same filesystem as data_dir. If the blob is
+    already stored, src_path is left in place.
+    Returns (sha256, path)
+    """
+    with open(src_path, "rb", buffering=0) as fp:
+        sha = sha256_stream(fp)
+    path = _blob_path(data_dir, sha, ext)
+    if not path.exists():
+        os.replace(src_path, path)
+    return sha, path
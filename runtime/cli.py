@@ -5,7 +5,7 @@ import sys
 from pathlib import Path
 
 from .config import RuntimeConfig
-from .engine import init_runtime, compute_assignment, ingest_session
+from .engine import init_runtime, compute_assignment, ingest_session_raw
 
 
 def main() -> None:
@@ -35,11 +35,12 @@ def main() -> None:
         return
 
     if args.cmd == "ingest-session":
+        # raw bytes: the engine decodes them (BOM / UTF-16 included)
         if args.file:
-            payload = json.loads(Path(args.file).read_text(encoding="utf-8"))
+            raw = Path(args.file).read_bytes()
         else:
-            payload = json.loads(sys.stdin.read())
-        out = ingest_session(cfg, payload, learner_slot=args.slot)
+            raw = sys.stdin.buffer.read()
+        out = ingest_session_raw(cfg, raw, learner_slot=args.slot)
         print(json.dumps(out, indent=2))
         return
 
@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from pathlib import Path
 import os
 
+from ._fsutil import ensure_dir
+
 
 @dataclass(frozen=True)
 class RuntimeConfig:
@@ -14,7 +16,7 @@ class RuntimeConfig:
     def load() -> "RuntimeConfig":
         # Local-first default: ./data
         base = Path(os.environ.get("SGC_DATA_DIR", "data")).resolve()
-        base.mkdir(parents=True, exist_ok=True)
+        ensure_dir(base)
         db_path = base / "sgc.sqlite3"
         secret_path = base / "device_secret.bin"
         return RuntimeConfig(
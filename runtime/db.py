@@ -2,14 +2,33 @@ from __future__ import annotations
 import sqlite3
 from pathlib import Path
 
+from ._fsutil import ensure_dir
 
-SCHEMA_V1 = """
-PRAGMA journal_mode=WAL;
 
+# Applied on every open: WAL persists in the db file, the rest are
+# connection-scoped. synchronous=NORMAL is safe under WAL (no corruption,
+# only the last commit can roll back on power loss).
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-20000",  # ~20 MB
+)
+
+# STRICT (type-checked columns) needs SQLite 3.37+; older builds get the
+# same tables without it.
+_STRICT = ", STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+_STRICT_ONLY = " STRICT" if _STRICT else ""
+
+# Small-row tables are WITHOUT ROWID: the TEXT primary key is the table's
+# only B-tree. Tables holding JSON payload blobs keep their rowid, per
+# SQLite's guidance for rows larger than ~1/20 of a page.
+SCHEMA_V1 = f"""
 CREATE TABLE IF NOT EXISTS meta (
   k TEXT PRIMARY KEY,
   v TEXT NOT NULL
-);
+) WITHOUT ROWID{_STRICT};
 
 CREATE TABLE IF NOT EXISTS catalog (
   content_id TEXT PRIMARY KEY,
@@ -18,7 +37,7 @@ CREATE TABLE IF NOT EXISTS catalog (
   summary TEXT,
   tags_json TEXT NOT NULL,
   updated_at_utc TEXT NOT NULL
-);
+) WITHOUT ROWID{_STRICT};
 
 CREATE TABLE IF NOT EXISTS sessions (
   session_id TEXT PRIMARY KEY,
@@ -27,14 +46,14 @@ CREATE TABLE IF NOT EXISTS sessions (
   ended_at_utc TEXT NOT NULL,
   instrument_id TEXT,
   session_json TEXT NOT NULL
-);
+){_STRICT_ONLY};
 
 CREATE TABLE IF NOT EXISTS assignments (
   assignment_id TEXT PRIMARY KEY,
   device_learner_id TEXT NOT NULL,
   created_at_utc TEXT NOT NULL,
   assignment_json TEXT NOT NULL
-);
+){_STRICT_ONLY};
 
 CREATE TABLE IF NOT EXISTS coach_feedback (
   feedback_id TEXT PRIMARY KEY,
@@ -42,29 +61,67 @@ CREATE TABLE IF NOT EXISTS coach_feedback (
   session_id TEXT NOT NULL,
   created_at_utc TEXT NOT NULL,
   feedback_json TEXT NOT NULL
-);
+){_STRICT_ONLY};
 
 CREATE TABLE IF NOT EXISTS attachments (
   attachment_id TEXT PRIMARY KEY,
   device_learner_id TEXT NOT NULL,
   created_at_utc TEXT NOT NULL,
   manifest_json TEXT NOT NULL
-);
+){_STRICT_ONLY};
+
+CREATE INDEX IF NOT EXISTS idx_sessions_lrn_started ON sessions(device_learner_id, started_at_utc DESC);
+CREATE INDEX IF NOT EXISTS idx_assignments_lrn_created ON assignments(device_learner_id, created_at_utc DESC);
+CREATE INDEX IF NOT EXISTS idx_feedback_lrn_created ON coach_feedback(device_learner_id, created_at_utc DESC);
 """
 
+_TABLES = ("meta", "catalog", "sessions", "assignments", "coach_feedback", "attachments")
+_INDEXES = ("idx_sessions_lrn_started", "idx_assignments_lrn_created", "idx_feedback_lrn_created")
+
+# Bump when SCHEMA_V1 gains objects that existing v1 databases must pick up.
+# Stored in PRAGMA user_version (file header; no table lookup to check).
+#   1: learner/timestamp indexes
+#   2: STRICT / WITHOUT ROWID tables (older tables are rebuilt)
+SCHEMA_REVISION = 2
+
 
 def connect(db_path: Path) -> sqlite3.Connection:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(db_path.parent)
     con = sqlite3.connect(str(db_path))
+    for pragma in CONNECTION_PRAGMAS:
+        con.execute(pragma)
     con.row_factory = sqlite3.Row
     return con
 
 
 def migrate(con: sqlite3.Connection) -> None:
-    con.executescript(SCHEMA_V1)
+    """
+    Apply SCHEMA_V1 unless PRAGMA user_version is already at SCHEMA_REVISION.
+    The check reads the db header, so migrating an up-to-date database is a
+    single PRAGMA: no DDL is parsed and sqlite_master is not consulted.
+
+    Tables from before revision 2 are rebuilt into the STRICT/WITHOUT ROWID
+    shape (rename, recreate, copy rows, drop), all in one transaction.
+    """
+    version = con.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_REVISION:
+        return
+    legacy = []
+    if version < 2:
+        present = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        legacy = [t for t in _TABLES if t in present]
+
+    script = ["BEGIN;"]
+    # indexes follow a renamed table; drop them so SCHEMA_V1 recreates them
+    script += [f"DROP INDEX IF EXISTS {idx};" for idx in _INDEXES] if legacy else []
+    script += [f"ALTER TABLE {t} RENAME TO _legacy_{t};" for t in legacy]
+    script.append(SCHEMA_V1)
+    for t in legacy:
+        script.append(f"INSERT INTO {t} SELECT * FROM _legacy_{t};")
+        script.append(f"DROP TABLE _legacy_{t};")
     # schema version marker
-    cur = con.execute("SELECT v FROM meta WHERE k='schema_version'")
-    row = cur.fetchone()
-    if not row:
-        con.execute("INSERT INTO meta(k, v) VALUES ('schema_version', 'v1')")
-    con.commit()
+    script.append("INSERT OR IGNORE INTO meta(k, v) VALUES ('schema_version', 'v1');")
+    script.append("ANALYZE;")
+    script.append(f"PRAGMA user_version={SCHEMA_REVISION};")
+    script.append("COMMIT;")
+    con.executescript("\n".join(script))
@@ -1,39 +1,58 @@
 from __future__ import annotations
 import json
+import os
+import sqlite3
 import time
-import uuid
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 
+from ._jsonutil import loads
 from .config import RuntimeConfig
 from .identity import ensure_device_identity, device_learner_id
 from .db import connect, migrate
-from .store import list_catalog, list_sessions, save_assignment, save_feedback, save_session
+from .store import list_catalog, recent_seen_content_ids, save_assignment, save_feedback, save_session
 from .policy import PolicyConfig, pick_next_assignment, coach_feedback_from_session
 
 
+# One migrated connection per db path for the life of the process.
+_CON_CACHE: Dict[Path, sqlite3.Connection] = {}
+
+
 def utc_now() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    # RFC3339, microseconds, Z suffix; formatted straight from the epoch clock
+    s, us = divmod(time.time_ns() // 1000, 1_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(s)) + f".{us:06d}Z"
+
+
+def _new_id(prefix: str, rnd: bytes) -> str:
+    # prefix + 32 hex chars for 16 random bytes
+    return f"{prefix}_{rnd.hex()}"
+
+
+def _get_con(cfg: RuntimeConfig) -> sqlite3.Connection:
+    con = _CON_CACHE.get(cfg.db_path)
+    if con is None:
+        con = connect(cfg.db_path)
+        migrate(con)
+        _CON_CACHE[cfg.db_path] = con
+    return con
 
 
 def init_runtime(cfg: RuntimeConfig) -> Dict[str, Any]:
     dev = ensure_device_identity(cfg.device_secret_path)
-    con = connect(cfg.db_path)
-    migrate(con)
+    con = _get_con(cfg)
     return {"device_id": dev.device_id, "db_path": str(cfg.db_path)}
 
 
 def compute_assignment(cfg: RuntimeConfig, learner_slot: int = 1) -> Dict[str, Any]:
     dev = ensure_device_identity(cfg.device_secret_path)
     lrn = device_learner_id(dev, learner_slot)
-    con = connect(cfg.db_path)
-    migrate(con)
+    con = _get_con(cfg)
 
     catalog = list_catalog(con)
-    recent = list_sessions(con, lrn, limit=20)
+    seen = recent_seen_content_ids(con, lrn, limit=10)
 
-    items = pick_next_assignment(catalog, recent, PolicyConfig())
+    items = pick_next_assignment(catalog, seen, PolicyConfig())
     payload = {
         "schema_id": "assignment",
         "schema_version": "v1",
@@ -43,22 +62,24 @@ def compute_assignment(cfg: RuntimeConfig, learner_slot: int = 1) -> Dict[str, A
         "items": items,
     }
 
-    assignment_id = "asg_" + uuid.uuid4().hex
-    save_assignment(con, assignment_id, lrn, payload["created_at_utc"], payload)
+    assignment_id = _new_id("asg", os.urandom(16))
+    with con:
+        save_assignment(con, assignment_id, lrn, payload["created_at_utc"], payload)
     return payload
 
 
 def ingest_session(cfg: RuntimeConfig, session_payload: Dict[str, Any], learner_slot: int = 1) -> Dict[str, Any]:
     dev = ensure_device_identity(cfg.device_secret_path)
     lrn = device_learner_id(dev, learner_slot)
-    con = connect(cfg.db_path)
-    migrate(con)
+    con = _get_con(cfg)
 
     # enforce device-local learner id if missing/mismatched
     session_payload = dict(session_payload)
     session_payload["device_learner_id"] = lrn
 
-    session_id = session_payload.get("session_id") or ("ses_" + uuid.uuid4().hex)
+    # one urandom read for both ids
+    rnd = os.urandom(32)
+    session_id = session_payload.get("session_id") or _new_id("ses", rnd[:16])
     session_payload["session_id"] = session_id
 
     started = session_payload.get("started_at_utc") or utc_now()
@@ -66,16 +87,6 @@ def ingest_session(cfg: RuntimeConfig, session_payload: Dict[str, Any], learner_
     session_payload["started_at_utc"] = started
     session_payload["ended_at_utc"] = ended
 
-    save_session(
-        con,
-        session_id=session_id,
-        device_learner_id=lrn,
-        started_at_utc=started,
-        ended_at_utc=ended,
-        instrument_id=session_payload.get("instrument_id"),
-        session_json=session_payload,
-    )
-
     fb = coach_feedback_from_session(session_payload)
     fb_payload = {
         "schema_id": "coach_feedback",
@@ -85,7 +96,30 @@ def ingest_session(cfg: RuntimeConfig, session_payload: Dict[str, Any], learner_
         "session_id": session_id,
         "feedback": fb,
     }
-    feedback_id = "fb_" + uuid.uuid4().hex
-    save_feedback(con, feedback_id, lrn, session_id, fb_payload["created_at_utc"], fb_payload)
+    feedback_id = _new_id("fb", rnd[16:])
+
+    # session + feedback land in one transaction
+    with con:
+        save_session(
+            con,
+            session_id=session_id,
+            device_learner_id=lrn,
+            started_at_utc=started,
+            ended_at_utc=ended,
+            instrument_id=session_payload.get("instrument_id"),
+            session_json=session_payload,
+        )
+        save_feedback(con, feedback_id, lrn, session_id, fb_payload["created_at_utc"], fb_payload)
 
     return {"stored_session_id": session_id, "coach_feedback": fb_payload}
+
+
+def ingest_session_raw(cfg: RuntimeConfig, raw: bytes, learner_slot: int = 1) -> Dict[str, Any]:
+    """
+    ingest_session for a still-serialized session JSON document (CLI input).
+    Accepts whatever json.loads does on bytes (UTF-8 with or without a BOM,
+    UTF-16/32). The normalized dict is always re-serialized for storage:
+    reusing the input text would keep duplicate keys, which SQLite's JSON
+    functions resolve to the first occurrence and Python to the last.
+    """
+    return ingest_session(cfg, loads(raw), learner_slot)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 import base64
+import functools
 import hashlib
 import os
 from dataclasses import dataclass
 from pathlib import Path
 
+from ._fsutil import ensure_dir
+
 
 @dataclass(frozen=True)
 class DeviceIdentity:
@@ -16,23 +19,26 @@ def _b32(n: bytes) -> str:
     return base64.b32encode(n).decode("ascii").rstrip("=").lower()
 
 
+@functools.lru_cache(maxsize=None)
 def ensure_device_identity(secret_path: Path) -> DeviceIdentity:
     """
     Device-local identity:
     - secret stored on device
     - device_id derived from secret hash (non-reversible)
+    Cached per process: the secret file is read once per path.
     """
-    secret_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(secret_path.parent)
     if not secret_path.exists():
         secret_path.write_bytes(os.urandom(32))
 
     secret = secret_path.read_bytes()
     h = hashlib.sha256(secret).digest()
     device_id = "dev_" + _b32(h[:10])  # short stable ID
-    secret_hex = hashlib.sha256(secret).hexdigest()
+    secret_hex = h.hex()  # same digest, no second hash
     return DeviceIdentity(device_id=device_id, device_secret_sha256=secret_hex)
 
 
+@functools.lru_cache(maxsize=None)
 def device_learner_id(device: DeviceIdentity, local_slot: int = 1) -> str:
     """
     Multiple local learners on one device: learner IDs are derived from device secret hash + slot.
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 
 
 @dataclass(frozen=True)
@@ -12,31 +12,29 @@ class PolicyConfig:
 
 def pick_next_assignment(
     catalog: List[Dict[str, Any]],
-    recent_sessions: List[Dict[str, Any]],
+    seen: Set[str],
     cfg: PolicyConfig,
 ) -> List[Dict[str, Any]]:
     """
     v0 policy:
     - prioritize drills first (practice-first), then lessons
     - de-prioritize content seen in the last N sessions
+      (`seen`, see store.recent_seen_content_ids)
     """
-    seen: set[str] = set()
-    for s in recent_sessions[:10]:
-        for a in s.get("attempts", []):
-            cid = a.get("content_id")
-            if cid:
-                seen.add(cid)
-
-    drills = [c for c in catalog if c.get("kind") == "drill"]
-    lessons = [c for c in catalog if c.get("kind") == "lesson"]
-
-    def score(item: Dict[str, Any]) -> int:
-        cid = item.get("content_id", "")
-        # unseen gets higher score
-        return 100 if cid not in seen else 10
-
-    ranked = sorted(drills, key=score, reverse=True) + sorted(lessons, key=score, reverse=True)
-    chosen = ranked[: cfg.max_items] if ranked else []
+    # one pass into (kind, unseen-first) buckets; catalog order is kept within
+    # each bucket, which is what a stable sort on the seen flag would give
+    drills_new: List[Dict[str, Any]] = []
+    drills_seen: List[Dict[str, Any]] = []
+    lessons_new: List[Dict[str, Any]] = []
+    lessons_seen: List[Dict[str, Any]] = []
+    buckets = {"drill": (drills_new, drills_seen), "lesson": (lessons_new, lessons_seen)}
+    for c in catalog:
+        pair = buckets.get(c.get("kind"))
+        if pair is not None:
+            pair[c.get("content_id", "") in seen].append(c)
+
+    ranked = drills_new + drills_seen + lessons_new + lessons_seen
+    chosen = ranked[: cfg.max_items]
 
     items: List[Dict[str, Any]] = []
     for i, it in enumerate(chosen, start=1):
@@ -76,18 +74,21 @@ def coach_feedback_from_session(session: Dict[str, Any]) -> Dict[str, Any]:
             "policy_version": "policy_v0"
         }
 
-    # Aggregate simple signals
-    accs = []
-    p95s = []
+    # Aggregate simple signals (single pass, running sums)
+    acc_sum = p95_sum = 0.0
+    acc_n = p95_n = 0
     for a in attempts:
         summ = a.get("summary") or {}
         if "note_accuracy_percent" in summ:
-            accs.append(float(summ["note_accuracy_percent"]))
+            acc_sum += float(summ["note_accuracy_percent"])
+            acc_n += 1
         if "timing_error_ms_p95" in summ:
-            p95s.append(float(summ["timing_error_ms_p95"]))
+            p95_sum += float(summ["timing_error_ms_p95"])
+            p95_n += 1
+    avg_acc = acc_sum / acc_n if acc_n else None
+    avg_p95 = p95_sum / p95_n if p95_n else None
 
-    if accs:
-        avg_acc = sum(accs) / max(1, len(accs))
+    if avg_acc is not None:
         observations.append(f"Average note accuracy ≈ {avg_acc:.1f}%.")
         if avg_acc < 75:
             next_steps.append("Slow down 10–15 BPM and aim for clean fretting and consistent picking.")
@@ -95,8 +96,7 @@ def coach_feedback_from_session(session: Dict[str, Any]) -> Dict[str, Any]:
         else:
             next_steps.append("Increase tempo by 5 BPM on the best-performing drill.")
 
-    if p95s:
-        avg_p95 = sum(p95s) / max(1, len(p95s))
+    if avg_p95 is not None:
         observations.append(f"Timing stability (p95 error) ≈ {avg_p95:.0f} ms.")
         if avg_p95 > 80:
             next_steps.append("Use a click and focus on downbeat alignment for 2 minutes per drill.")
@@ -104,7 +104,7 @@ def coach_feedback_from_session(session: Dict[str, Any]) -> Dict[str, Any]:
         else:
             next_steps.append("Add a 2-minute groove loop at current tempo to build endurance.")
 
-    if not accs and not p95s:
+    if avg_acc is None and avg_p95 is None:
         observations.append("Session captured attempts but no summary metrics.")
         next_steps.append("Enable summary metrics capture (timing/accuracy) when available.")
         return {
@@ -117,9 +117,9 @@ def coach_feedback_from_session(session: Dict[str, Any]) -> Dict[str, Any]:
         }
 
     tags = []
-    if accs and (sum(accs)/len(accs)) < 75:
+    if avg_acc is not None and avg_acc < 75:
         tags.append("accuracy_low")
-    if p95s and (sum(p95s)/len(p95s)) > 80:
+    if avg_p95 is not None and avg_p95 > 80:
         tags.append("timing_unstable")
     if not tags:
         tags.append("steady_progress")
@@ -2,8 +2,12 @@ from __future__ import annotations
 import json
 import sqlite3
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set
 
+from ._jsonutil import dumps as _dumps, loads as _loads
+
+# Single-row writers (save_*) do not commit: callers own the transaction and
+# group related writes in one `with con:` block (one fsync per CLI command).
 
 @dataclass(frozen=True)
 class CatalogItem:
@@ -15,39 +19,52 @@ class CatalogItem:
     updated_at_utc: str
 
 
+_UPSERT_CATALOG_SQL = """
+INSERT INTO catalog(content_id, kind, title, summary, tags_json, updated_at_utc)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(content_id) DO UPDATE SET
+  kind=excluded.kind,
+  title=excluded.title,
+  summary=excluded.summary,
+  tags_json=excluded.tags_json,
+  updated_at_utc=excluded.updated_at_utc
+"""
+
+
 def upsert_catalog(con: sqlite3.Connection, updated_at_utc: str, items: List[CatalogItem]) -> None:
-    for it in items:
-        con.execute(
-            """
-            INSERT INTO catalog(content_id, kind, title, summary, tags_json, updated_at_utc)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(content_id) DO UPDATE SET
-              kind=excluded.kind,
-              title=excluded.title,
-              summary=excluded.summary,
-              tags_json=excluded.tags_json,
-              updated_at_utc=excluded.updated_at_utc
-            """,
-            (it.content_id, it.kind, it.title, it.summary, json.dumps(it.tags), updated_at_utc),
-        )
-    con.commit()
+    # one prepared statement + one transaction for the whole batch
+    rows = [
+        (it.content_id, it.kind, it.title, it.summary, _dumps(it.tags), updated_at_utc)
+        for it in items
+    ]
+    with con:
+        con.executemany(_UPSERT_CATALOG_SQL, rows)
+
+
+def _tuple_cursor(con: sqlite3.Connection) -> sqlite3.Cursor:
+    # plain tuples: cheaper than sqlite3.Row for positional unpacking
+    cur = con.cursor()
+    cur.row_factory = None
+    return cur
+
+
+def iter_catalog(con: sqlite3.Connection) -> Iterator[Dict[str, Any]]:
+    cur = _tuple_cursor(con).execute(
+        "SELECT content_id, kind, title, summary, tags_json, updated_at_utc FROM catalog ORDER BY kind, title"
+    )
+    for content_id, kind, title, summary, tags_json, updated_at_utc in cur:
+        yield {
+            "content_id": content_id,
+            "kind": kind,
+            "title": title,
+            "summary": summary or "",
+            "tags": _loads(tags_json or "[]"),
+            "updated_at_utc": updated_at_utc,
+        }
 
 
 def list_catalog(con: sqlite3.Connection) -> List[Dict[str, Any]]:
-    rows = con.execute("SELECT * FROM catalog ORDER BY kind, title").fetchall()
-    out: List[Dict[str, Any]] = []
-    for r in rows:
-        out.append(
-            {
-                "content_id": r["content_id"],
-                "kind": r["kind"],
-                "title": r["title"],
-                "summary": r["summary"] or "",
-                "tags": json.loads(r["tags_json"] or "[]"),
-                "updated_at_utc": r["updated_at_utc"],
-            }
-        )
-    return out
+    return list(iter_catalog(con))
 
 
 def save_session(con: sqlite3.Connection, session_id: str, device_learner_id: str, started_at_utc: str,
@@ -57,17 +74,55 @@ def save_session(con: sqlite3.Connection, session_id: str, device_learner_id: st
         INSERT INTO sessions(session_id, device_learner_id, started_at_utc, ended_at_utc, instrument_id, session_json)
         VALUES (?, ?, ?, ?, ?, ?)
         """,
-        (session_id, device_learner_id, started_at_utc, ended_at_utc, instrument_id, json.dumps(session_json)),
+        (session_id, device_learner_id, started_at_utc, ended_at_utc, instrument_id, _dumps(session_json)),
     )
-    con.commit()
+
+
+def iter_sessions(con: sqlite3.Connection, device_learner_id: str, limit: int = 20) -> Iterator[Dict[str, Any]]:
+    cur = _tuple_cursor(con).execute(
+        "SELECT session_json FROM sessions WHERE device_learner_id=? ORDER BY started_at_utc DESC LIMIT ?",
+        (device_learner_id, limit),
+    )
+    for (session_json,) in cur:
+        yield _loads(session_json)
 
 
 def list_sessions(con: sqlite3.Connection, device_learner_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+    return list(iter_sessions(con, device_learner_id, limit))
+
+
+def recent_seen_content_ids(con: sqlite3.Connection, device_learner_id: str, limit: int = 10) -> Set[str]:
+    """
+    content_ids attempted in the learner's `limit` most recent sessions.
+    Extracted in SQLite via json_each, so session blobs are normally never
+    decoded in Python. Rows SQLite cannot parse (e.g. NaN metrics as written
+    by json.dumps) come back whole and are decoded here instead.
+    """
     rows = con.execute(
-        "SELECT session_json FROM sessions WHERE device_learner_id=? ORDER BY started_at_utc DESC LIMIT ?",
+        """
+        WITH s AS (
+          SELECT session_json, json_valid(session_json) AS ok FROM sessions
+          WHERE device_learner_id=? ORDER BY started_at_utc DESC LIMIT ?
+        )
+        SELECT DISTINCT json_extract(je.value, '$.content_id') AS cid, NULL AS raw
+        FROM s, json_each(CASE WHEN s.ok THEN s.session_json END, '$.attempts') je
+        WHERE je.type = 'object' AND cid IS NOT NULL AND cid != ''
+        UNION ALL
+        SELECT NULL, session_json FROM s WHERE NOT ok
+        """,
         (device_learner_id, limit),
     ).fetchall()
-    return [json.loads(r["session_json"]) for r in rows]
+    seen: Set[str] = set()
+    for cid, raw in rows:
+        if raw is None:
+            seen.add(cid)
+            continue
+        # stdlib parser: it accepts the NaN/Infinity tokens SQLite rejected
+        for a in json.loads(raw).get("attempts", []):
+            cid = a.get("content_id") if isinstance(a, dict) else None
+            if cid:
+                seen.add(cid)
+    return seen
 
 
 def save_assignment(con: sqlite3.Connection, assignment_id: str, device_learner_id: str,
@@ -77,9 +132,8 @@ def save_assignment(con: sqlite3.Connection, assignment_id: str, device_learner_
         INSERT INTO assignments(assignment_id, device_learner_id, created_at_utc, assignment_json)
         VALUES (?, ?, ?, ?)
         """,
-        (assignment_id, device_learner_id, created_at_utc, json.dumps(assignment_json)),
+        (assignment_id, device_learner_id, created_at_utc, _dumps(assignment_json)),
     )
-    con.commit()
 
 
 def latest_assignment(con: sqlite3.Connection, device_learner_id: str) -> Optional[Dict[str, Any]]:
@@ -87,7 +141,7 @@ def latest_assignment(con: sqlite3.Connection, device_learner_id: str) -> Option
         "SELECT assignment_json FROM assignments WHERE device_learner_id=? ORDER BY created_at_utc DESC LIMIT 1",
         (device_learner_id,),
     ).fetchone()
-    return json.loads(row["assignment_json"]) if row else None
+    return _loads(row["assignment_json"]) if row else None
 
 
 def save_feedback(con: sqlite3.Connection, feedback_id: str, device_learner_id: str, session_id: str,
@@ -97,9 +151,8 @@ def save_feedback(con: sqlite3.Connection, feedback_id: str, device_learner_id:
         INSERT INTO coach_feedback(feedback_id, device_learner_id, session_id, created_at_utc, feedback_json)
         VALUES (?, ?, ?, ?, ?)
         """,
-        (feedback_id, device_learner_id, session_id, created_at_utc, json.dumps(feedback_json)),
+        (feedback_id, device_learner_id, session_id, created_at_utc, _dumps(feedback_json)),
     )
-    con.commit()
 
 
 def save_attachments_manifest(con: sqlite3.Connection, attachment_id: str, device_learner_id: str,
@@ -109,6 +162,5 @@ def save_attachments_manifest(con: sqlite3.Connection, attachment_id: str, devic
         INSERT INTO attachments(attachment_id, device_learner_id, created_at_utc, manifest_json)
         VALUES (?, ?, ?, ?)
         """,
-        (attachment_id, device_learner_id, created_at_utc, json.dumps(manifest_json)),
+        (attachment_id, device_learner_id, created_at_utc, _dumps(manifest_json)),
     )
-    con.commit()
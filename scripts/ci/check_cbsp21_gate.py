@@ -19,6 +19,7 @@ import json
 import os
 import subprocess
 import sys
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import Any, Dict, List, Set
 
@@ -33,6 +34,9 @@ GOVERNED_PATHS = {
     "fixtures/",
     "scripts/ci/",
 }
+# str.startswith/endswith take a tuple: one C-level call per path
+_GOVERNED_TUPLE = tuple(sorted(GOVERNED_PATHS))
+_CODE_EXTS = (".py", ".json", ".yaml", ".yml", ".sh", ".ps1")
 
 
 def get_changed_files() -> List[str]:
@@ -61,13 +65,12 @@ def get_changed_files() -> List[str]:
 
 def is_governed_file(path: str) -> bool:
     """Check if file is in a governed area."""
-    return any(path.startswith(gp) for gp in GOVERNED_PATHS)
+    return path.startswith(_GOVERNED_TUPLE)
 
 
 def is_code_file(path: str) -> bool:
     """Check if file is a code file (not just docs)."""
-    code_exts = {".py", ".json", ".yaml", ".yml", ".sh", ".ps1"}
-    return Path(path).suffix.lower() in code_exts
+    return path.lower().endswith(_CODE_EXTS)
 
 
 def load_exemptions() -> Set[str]:
@@ -84,8 +87,6 @@ def load_exemptions() -> Set[str]:
 
 def is_exempt(path: str, exempt_patterns: Set[str]) -> bool:
     """Check if path matches any exempt pattern."""
-    from fnmatch import fnmatch
-
     for pattern in exempt_patterns:
         if fnmatch(path, pattern):
             return True
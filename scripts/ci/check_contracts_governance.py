@@ -1,31 +1,57 @@
 #!/usr/bin/env python3
-import argparse, json, os, re, subprocess, sys
+import argparse, functools, json, os, re, subprocess, sys, tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Tuple, Union
 
-HEX64_RE = re.compile(r"^[0-9a-f]{64}$")
+_V1_RE = re.compile(r"_v1\.schema\.(?:json|sha256)$")
 
 @dataclass
 class Violation:
     code: str
     message: str
 
-def run_git(args: List[str], cwd: Path) -> str:
-    p = subprocess.run(["git", *args], cwd=str(cwd), capture_output=True, text=True)
+def run_git(args: List[str], cwd: Path, binary: bool = False) -> Union[str, bytes]:
+    """git stdout as text, or as raw bytes when binary=True (no decoding)."""
+    p = subprocess.run(["git", *args], cwd=str(cwd), capture_output=True, text=not binary)
     if p.returncode != 0:
-        raise RuntimeError(p.stderr.strip() or p.stdout.strip())
+        err = p.stderr.decode("utf-8", "replace") if binary else p.stderr
+        out = p.stdout.decode("utf-8", "replace") if binary else p.stdout
+        raise RuntimeError(err.strip() or out.strip())
     return p.stdout
 
+def stream_git(args: List[str], cwd: Path) -> Iterator[str]:
+    """Yield git stdout line by line. Closing the generator early stops git."""
+    # stderr goes to a temp file, not a pipe: nothing reads it until stdout is
+    # drained, and git would block on a full stderr pipe (deadlock)
+    with tempfile.TemporaryFile() as err_fh:
+        p = subprocess.Popen(["git", *args], cwd=str(cwd), stdout=subprocess.PIPE,
+                             stderr=err_fh, text=True)
+        done = False
+        try:
+            for ln in p.stdout:
+                yield ln
+            done = True
+        finally:
+            if not done:
+                p.kill()
+            p.stdout.close()
+            rc = p.wait()
+        if rc != 0:
+            err_fh.seek(0)
+            err = err_fh.read().decode("utf-8", "replace")
+            raise RuntimeError(err.strip() or f"git {' '.join(args)} exited {rc}")
+
 def changed_files(repo_root: Path, base_ref: str) -> List[str]:
-    out = run_git(["diff","--name-only",f"{base_ref}...HEAD"], cwd=repo_root)
-    return [x.strip() for x in out.splitlines() if x.strip()]
+    # -z: NUL-terminated, unquoted paths; split once, no per-line strip
+    out = run_git(["diff","--name-only","-z",f"{base_ref}...HEAD"], cwd=repo_root, binary=True)
+    return [x.decode("utf-8", "replace") for x in out.split(b"\0") if x]
 
 def read_contracts_version(repo_root: Path) -> Tuple[bool,str]:
     fp = repo_root/"contracts"/"CONTRACTS_VERSION.json"
     if not fp.exists():
         return (False,"")
-    data = json.loads(fp.read_text(encoding="utf-8"))
+    data = json.loads(fp.read_bytes())  # json detects UTF-8 from bytes
     return (bool(data.get("public_released", False)), str(data.get("tag","") or ""))
 
 def is_schema(p: str) -> bool:
@@ -35,32 +61,54 @@ def is_sha(p: str) -> bool:
     return p.startswith("contracts/") and p.endswith(".schema.sha256")
 
 def stem(p: str) -> str:
-    name = Path(p).name
-    return name.replace(".schema.json","").replace(".schema.sha256","")
+    # p is a .schema.json/.schema.sha256 path; one scan drops the suffix
+    return Path(p).name.rsplit(".schema.", 1)[0]
 
 def is_v1(p: str) -> bool:
-    return bool(re.search(r"_v1\.schema\.(json|sha256)$", p))
+    return _V1_RE.search(p) is not None
 
 def check_sha_format(repo_root: Path) -> List[Violation]:
     v=[]
     for fp in (repo_root/"contracts").glob("*.schema.sha256"):
-        raw = fp.read_text(encoding="utf-8").strip()
-        if not HEX64_RE.match(raw):
+        raw = fp.read_bytes().strip()
+        # exactly 64 bytes, nothing left once lowercase hex digits are stripped
+        if len(raw) != 64 or raw.strip(b"0123456789abcdef"):
             v.append(Violation("SHA256_FORMAT", f"{fp.as_posix()} must be 64 lowercase hex only"))
     return v
 
-def _extract_added_lines(diff: str) -> str:
-    """Extract only added lines from unified diff (no +++ headers)."""
-    return "\n".join(
-        ln[1:]
-        for ln in diff.splitlines()
-        if ln.startswith("+") and not ln.startswith("+++ ")
-    )
+def _iter_added_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Added lines from a unified diff stream (no +++ headers), '+' stripped."""
+    for ln in lines:
+        if ln.startswith("+") and not ln.startswith("+++ "):
+            yield ln[1:].rstrip("\n")
+
+@functools.lru_cache(maxsize=256)
+def _stem_pattern(stem: str) -> "re.Pattern[str]":
+    return re.compile(rf"(?<![A-Za-z0-9_]){re.escape(stem)}(?![A-Za-z0-9_])")
 
 def _stem_mentioned(text: str, stem: str) -> bool:
     """Token-safe match: stem must appear as whole word (not partial)."""
-    pat = re.compile(rf"(?<![A-Za-z0-9_]){re.escape(stem)}(?![A-Za-z0-9_])")
-    return pat.search(text) is not None
+    return _stem_pattern(stem).search(text) is not None
+
+@functools.lru_cache(maxsize=64)
+def _stems_pattern(stems: Tuple[str, ...]) -> "re.Pattern[str]":
+    alt = "|".join(re.escape(s) for s in sorted(stems, key=len, reverse=True))
+    return re.compile(rf"(?<![A-Za-z0-9_])({alt})(?![A-Za-z0-9_])")
+
+def _missing_stems(text: str, stems: List[str]) -> List[str]:
+    """Stems not mentioned in text, found with at most one alternation pass over it."""
+    # Literal prefilter: a stem that is not even a substring cannot match, and
+    # most added lines contain none, so the regex only runs over the hits.
+    hit = [s for s in stems if s in text]
+    if not hit:
+        return list(stems)
+    if len(hit) == 1:
+        found = {hit[0]} if _stem_mentioned(text, hit[0]) else set()
+    else:
+        found = {m.group(1) for m in _stems_pattern(tuple(hit)).finditer(text)}
+    # finditer reports one stem per start position and never overlaps (e.g. "a"
+    # inside "a-b"); re-check the other hits individually to stay exact
+    return [s for s in stems if s not in found and (s not in hit or not _stem_mentioned(text, s))]
 
 def check_changelog(
     repo_root: Path, changed: List[str], base_ref: str, debug: bool = False
@@ -71,11 +119,22 @@ def check_changelog(
     if "contracts/CHANGELOG.md" not in changed:
         return [Violation("CHANGELOG_REQUIRED","Contract schema/hash changed but contracts/CHANGELOG.md was not updated.")]
 
-    diff = run_git(
+    stems = sorted({stem(p) for p in contract_changes})
+    # Stream the diff and check each added line as it arrives (stems never
+    # span lines); stop reading once every stem is seen, unless debugging.
+    lines = stream_git(
         ["diff", f"{base_ref}...HEAD", "--", "contracts/CHANGELOG.md"],
         cwd=repo_root,
     )
-    added_only = _extract_added_lines(diff)
+    added: List[str] = []
+    missing = stems
+    for ln in _iter_added_lines(lines):
+        added.append(ln)
+        missing = _missing_stems(ln, missing)
+        if not missing and not debug:
+            lines.close()
+            break
+    added_only = "\n".join(added)
 
     if debug:
         print(
@@ -84,9 +143,6 @@ def check_changelog(
             file=sys.stderr,
         )
 
-    stems = sorted({stem(p) for p in contract_changes})
-    missing = [s for s in stems if not _stem_mentioned(added_only, s)]
-
     if missing:
         # Always print scanned content on failure (developer UX)
         if not debug:
@@ -136,9 +192,11 @@ def main():
     if not violations:
         print("[contracts-gov] PASS")
         return 0
-    print(f"[contracts-gov] FAIL ({len(violations)})", file=sys.stderr)
-    for v in violations:
-        print(f"  - [{v.code}] {v.message}", file=sys.stderr)
+    # one write for the whole report
+    sys.stderr.write(
+        f"[contracts-gov] FAIL ({len(violations)})\n"
+        + "".join(f"  - [{v.code}] {v.message}\n" for v in violations)
+    )
     return 1
 
 if __name__ == "__main__":
@@ -1,11 +1,44 @@
 #!/usr/bin/env python3
-import argparse, re, sys
+import argparse, os, re, sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-BLOCKED = [
-  r"\bgcode\b", r"\btoolpath\b", r"\brmos\b", r"\bfixture\b",
-  r"\bfeedrate\b", r"\bspindle\b", r"\bcam\b"
-]
+# bare lowercase ASCII terms: the single source for the regex and the pre-check
+BLOCKED_TERMS = ("gcode", "toolpath", "rmos", "fixture", "feedrate", "spindle", "cam")
+BLOCKED = [rf"\b{re.escape(t)}\b" for t in BLOCKED_TERMS]
+# all BLOCKED terms fused into one pattern: a single scan per file
+_BLOCKED_RE = re.compile("|".join(BLOCKED), re.IGNORECASE)
+# needles for a cheap literal pre-check on lowered bytes
+_BLOCKED_BYTES = tuple(t.encode("ascii") for t in BLOCKED_TERMS)
+
+_SCAN_SUFFIXES = (".json", ".md", ".txt")
+
+def _walk(root):
+    """Non-empty regular files to scan under root, via scandir's cached d_type."""
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            # symlinked files are scanned (as rglob + is_file did); symlinked
+            # directories are not descended into
+            elif (entry.is_file()
+                  and entry.name.endswith(_SCAN_SUFFIXES)
+                  and entry.stat().st_size):
+                yield Path(entry.path)
+
+def _scan_one(fp):
+    data = fp.read_bytes()
+    # common case: no literal hit, so skip decoding and the regex. Only exact
+    # for ASCII: bytes.lower() folds ASCII alone, while IGNORECASE also matches
+    # e.g. "ſpindle" or "FİXTURE", so any other file always gets the regex.
+    if data.isascii():
+        low = data.lower()
+        if not any(t in low for t in _BLOCKED_BYTES):
+            return None
+    m = _BLOCKED_RE.search(data.decode("utf-8", errors="replace"))
+    if m:
+        return f"{fp.as_posix()} matched {m.group(0)}"
+    return None
 
 def main():
     ap = argparse.ArgumentParser()
@@ -16,19 +49,13 @@ def main():
     if not contracts.exists():
         print("[no-toolbox-terms] PASS")
         return 0
-    pats = [re.compile(p, re.IGNORECASE) for p in BLOCKED]
-    bad=[]
-    for fp in contracts.rglob("*"):
-        if fp.is_file() and fp.suffix in {".json",".md",".txt"}:
-            txt = fp.read_text(encoding="utf-8", errors="replace")
-            for p in pats:
-                if p.search(txt):
-                    bad.append(f"{fp.as_posix()} matched {p.pattern}")
-                    break
+    files = list(_walk(contracts))
+    # file reads release the GIL, so a thread pool overlaps the I/O
+    with ThreadPoolExecutor() as ex:
+        bad = sorted(r for r in ex.map(_scan_one, files) if r)
     if bad:
-        print(f"[no-toolbox-terms] FAIL ({len(bad)})", file=sys.stderr)
-        for b in bad:
-            print("  - "+b, file=sys.stderr)
+        # one write for the whole report
+        sys.stderr.write(f"[no-toolbox-terms] FAIL ({len(bad)})\n" + "".join(f"  - {b}\n" for b in bad))
         return 1
     print("[no-toolbox-terms] PASS")
     return 0
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
@@ -37,13 +38,9 @@ DEFAULT_POLICY = CoachPolicyConfig()
 
 
 def _top_k_steps(error_by_step: Dict[str, float], k: int = 3) -> List[Tuple[int, float]]:
-    items: List[Tuple[int, float]] = []
-    for ks, v in error_by_step.items():
-        if not ks.isdigit():
-            continue
-        items.append((int(ks), float(v)))
-    items.sort(key=lambda t: t[1], reverse=True)
-    return items[:k]
+    # nlargest keeps ties in input order, same as a stable reverse sort
+    items = ((int(ks), float(v)) for ks, v in error_by_step.items() if ks.isdigit())
+    return heapq.nlargest(k, items, key=lambda t: t[1])
 
 
 def _step_label(step_i: int, grid: int) -> str:
@@ -55,6 +52,11 @@ def _step_label(step_i: int, grid: int) -> str:
     return f"step {step_i}/{grid}"
 
 
+def _uniq(xs: List[str]) -> List[str]:
+    """Stripped, non-empty strings, first occurrence wins (dicts keep insertion order)."""
+    return list(dict.fromkeys(filter(None, (x.strip() for x in xs))))
+
+
 def evaluate_session(
     session: SessionRecord,
     *,
@@ -71,6 +73,14 @@ def evaluate_session(
     perf = session.performance
     timing = session.timing
 
+    # Thresholds and severities bound once; the checks below reuse them per step.
+    sev_primary = Severity.primary
+    sev_secondary = Severity.secondary
+    step_pri_ms = policy.step_error_primary_ms
+    step_sec_ms = policy.step_error_secondary_ms
+    mean_pri_ms = policy.mean_error_primary_ms
+    mean_sec_ms = policy.mean_error_secondary_ms
+
     findings: List[CoachFinding] = []
     strengths: List[str] = []
     weaknesses: List[str] = []
@@ -79,10 +89,10 @@ def evaluate_session(
     mean_err = float(perf.timing_error_ms.mean)
     std_err = float(perf.timing_error_ms.std)
 
-    if mean_err <= policy.mean_error_secondary_ms:
+    if mean_err <= mean_sec_ms:
         strengths.append("Timing mean error is low.")
     else:
-        sev = Severity.primary if mean_err >= policy.mean_error_primary_ms else Severity.secondary
+        sev = sev_primary if mean_err >= mean_pri_ms else sev_secondary
         weaknesses.append("Timing mean error is elevated.")
         findings.append(
             CoachFinding(
@@ -95,21 +105,23 @@ def evaluate_session(
 
     # ---- 2) Step-local timing hotspots ----
     top_steps = _top_k_steps(perf.error_by_step, k=3)
-    primary_step: Tuple[int, float] | None = None
+    primary_step: Tuple[str, float] | None = None  # (label, error)
+    grid = timing.grid
 
     for step_i, step_err in top_steps:
-        if step_err >= policy.step_error_primary_ms and primary_step is None:
-            primary_step = (step_i, step_err)
+        step_label = _step_label(step_i, grid)
+        if step_err >= step_pri_ms and primary_step is None:
+            primary_step = (step_label, step_err)
 
-        if step_err >= policy.step_error_secondary_ms:
-            sev = Severity.primary if step_err >= policy.step_error_primary_ms else Severity.secondary
-            weaknesses.append(f"Hotspot at {_step_label(step_i, timing.grid)}.")
+        if step_err >= step_sec_ms:
+            sev = sev_primary if step_err >= step_pri_ms else sev_secondary
+            weaknesses.append(f"Hotspot at {step_label}.")
             findings.append(
                 CoachFinding(
                     type="timing",
                     severity=sev,
                     evidence=FindingEvidence(step=step_i, mean_error_ms=step_err),
-                    interpretation=f"Timing hotspot: {_step_label(step_i, timing.grid)} ~ {step_err:.1f} ms.",
+                    interpretation=f"Timing hotspot: {step_label} ~ {step_err:.1f} ms.",
                 )
             )
 
@@ -133,13 +145,13 @@ def evaluate_session(
     # 2) global timing if elevated
     # 3) otherwise consistency (tempo stability)
     if primary_step is not None:
-        step_i, step_err = primary_step
+        step_label, step_err = primary_step
         focus = FocusRecommendation(
             concept="grid_alignment",
-            reason=f"Highest hotspot at {_step_label(step_i, timing.grid)} (~{step_err:.1f} ms).",
+            reason=f"Highest hotspot at {step_label} (~{step_err:.1f} ms).",
         )
         confidence = 0.90
-    elif mean_err >= policy.mean_error_secondary_ms:
+    elif mean_err >= mean_sec_ms:
         focus = FocusRecommendation(
             concept="timing_foundation",
             reason=f"Mean timing error {mean_err:.1f} ms is above target.",
@@ -153,17 +165,6 @@ def evaluate_session(
         confidence = 0.65
 
     # Keep bullets reasonably sized and deduplicate deterministically
-    def _uniq(xs: List[str]) -> List[str]:
-        out: List[str] = []
-        seen = set()
-        for x in xs:
-            x2 = x.strip()
-            if not x2 or x2 in seen:
-                continue
-            seen.add(x2)
-            out.append(x2)
-        return out
-
     strengths = _uniq(strengths)
     weaknesses = _uniq(weaknesses)
 
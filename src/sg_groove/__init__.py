@@ -11,7 +11,7 @@ from .models import (
     GrooveState,
 )
 from .groove_layer import GrooveLayer
-from .window_eval import compute_window_stats
+from .window_eval import compute_window_stats, window_stats_from_columns
 
 __all__ = [
     "PerformanceEvent",
@@ -20,4 +20,5 @@ __all__ = [
     "GrooveState",
     "GrooveLayer",
     "compute_window_stats",
+    "window_stats_from_columns",
 ]
@@ -6,8 +6,8 @@ This is a deterministic, rules-first implementation (Mode-1).
 """
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from .models import (
     AssistPolicy,
@@ -23,6 +23,209 @@ from .models import (
 from .window_eval import compute_window_stats
 
 
+# Control templates, built once. _compute_controls hands out a fresh copy per
+# window (_build_output pops "_rationale" from it) and, for recovery/stable,
+# fills in the feel fields that come from the engine context.
+
+# Engine context is missing — fail boringly.
+_FROZEN_TEMPLATE: Dict[str, Any] = {
+    "tempo": {
+        "policy": TempoPolicy.steady_clock.value,
+        "nudge_strength": 0.0,
+        "max_delta_pct_per_min": 0,
+    },
+    "arrangement": {
+        "density_target": DensityTarget.medium.value,
+        "instrumentation_policy": "keep_layers",
+        "dynamics_follow": "fixed",
+    },
+    "loop": {
+        "policy": LoopPolicy.none.value,
+        "length_bars": 4,
+        "exit_condition": "manual",
+    },
+    "feel": {
+        "feel_policy": "straight",
+        "grid": "quarter",  # conservative, no grid claims
+        "click_policy": "off",
+    },
+    "assist": {
+        "assist_policy": AssistPolicy.minimal.value,
+        "ghost_drums": "off",
+        "count_in_bars": 0,
+    },
+    "change_policy": {
+        "allow_modulation": False,
+        "allow_tempo_change_events": False,
+        "allow_density_probes": False,
+    },
+    "_rationale": {
+        "trigger": "missing_context",
+        "notes": "No engine context; freezing corrective behavior to avoid wrong claims.",
+    },
+}
+
+# Player is unstable — support and simplify.
+_UNSTABLE_TEMPLATE: Dict[str, Any] = {
+    "tempo": {
+        "policy": TempoPolicy.steady_clock.value,
+        "nudge_strength": 0.4,
+        "max_delta_pct_per_min": 3,
+    },
+    "arrangement": {
+        "density_target": DensityTarget.sparse.value,
+        "instrumentation_policy": "reduce_layers",
+        "dynamics_follow": "fixed",
+    },
+    "loop": {
+        "policy": LoopPolicy.micro_loop.value,
+        "length_bars": 4,
+        "exit_condition": "stability_recovered",
+    },
+    "feel": {
+        "feel_policy": "straight",
+        "grid": "eighth",
+        "click_policy": "prominent",
+    },
+    "assist": {
+        "assist_policy": AssistPolicy.supportive.value,
+        "ghost_drums": "light",
+        "count_in_bars": 2,
+    },
+    "change_policy": {
+        "allow_modulation": False,
+        "allow_tempo_change_events": False,
+        "allow_density_probes": False,
+    },
+    "_rationale": {
+        "trigger": "low_tempo_stability",
+        "notes": "Detected instability; simplifying and gating changes until stable.",
+    },
+}
+
+# Recovering from instability — de-escalate gradually.
+_RECOVERY_TEMPLATE: Dict[str, Any] = {
+    "tempo": {
+        "policy": TempoPolicy.follow_player.value,
+        "nudge_strength": 0.25,
+        "max_delta_pct_per_min": 5,
+    },
+    "arrangement": {
+        "density_target": DensityTarget.medium.value,
+        "instrumentation_policy": "keep_layers",
+        "dynamics_follow": "soft_follow",
+    },
+    "loop": {
+        "policy": LoopPolicy.loop_section.value,
+        "length_bars": 4,
+        "exit_condition": "stability_recovered",
+    },
+    "feel": {
+        "feel_policy": None,  # engine_context.feel
+        "grid": None,  # engine_context.grid
+        "click_policy": "subtle",
+    },
+    "assist": {
+        "assist_policy": AssistPolicy.standard.value,
+        "ghost_drums": "off",
+        "count_in_bars": 0,
+    },
+    "change_policy": {
+        "allow_modulation": False,
+        "allow_tempo_change_events": True,
+        "allow_density_probes": True,
+    },
+    "_rationale": {
+        "trigger": "stability_recovering",
+        "notes": "Stability recovered; relaxing assist and restoring density.",
+    },
+}
+
+# Player is stable — follow and allow exploration.
+_STABLE_TEMPLATE: Dict[str, Any] = {
+    "tempo": {
+        "policy": TempoPolicy.follow_player.value,
+        "nudge_strength": 0.2,
+        "max_delta_pct_per_min": 5,
+    },
+    "arrangement": {
+        "density_target": DensityTarget.medium.value,
+        "instrumentation_policy": "keep_layers",
+        "dynamics_follow": "soft_follow",
+    },
+    "loop": {
+        "policy": LoopPolicy.none.value,
+        "length_bars": 4,
+        "exit_condition": "manual",
+    },
+    "feel": {
+        "feel_policy": None,  # engine_context.feel
+        "grid": None,  # engine_context.grid
+        "click_policy": "subtle",
+    },
+    "assist": {
+        "assist_policy": AssistPolicy.standard.value,
+        "ghost_drums": "off",
+        "count_in_bars": 1,
+    },
+    "change_policy": {
+        "allow_modulation": False,
+        "allow_tempo_change_events": True,
+        "allow_density_probes": True,
+    },
+    "_rationale": {
+        "trigger": "stable_baseline",
+        "notes": "Baseline stable play; no corrective action required.",
+    },
+}
+
+
+# Enum members the per-window state updates compare and assign, bound once:
+# a module global is a plain dict hit, a member lookup goes through EnumMeta.
+_LOOP_MICRO = LoopPolicy.micro_loop
+_LOOP_SECTION = LoopPolicy.loop_section
+_LOOP_NONE = LoopPolicy.none
+_DENSITY_MEDIUM = DensityTarget.medium
+_DENSITY_SPARSE = DensityTarget.sparse
+_TEMPO_FOLLOW = TempoPolicy.follow_player
+_TEMPO_STEADY = TempoPolicy.steady_clock
+
+_POLICY_TABLE: Dict[str, Dict[str, Any]] = {
+    "frozen": _FROZEN_TEMPLATE,
+    "unstable": _UNSTABLE_TEMPLATE,
+    "recovery": _RECOVERY_TEMPLATE,
+    "stable": _STABLE_TEMPLATE,
+}
+_FEEL_FROM_CONTEXT = frozenset({"recovery", "stable"})
+
+
+def _clone_controls(template: Dict[str, Any]) -> Dict[str, Any]:
+    # Templates are exactly two levels deep and every section is a dict of
+    # scalars, so copying each section is a full clone (no deepcopy needed).
+    return {k: v.copy() for k, v in template.items()}
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last _utc_now_iso call
+_last_iso_sec: Tuple[int, str] = (-1, "")
+
+
+def _utc_now_iso() -> str:
+    # RFC3339 with microseconds and Z suffix, from a single epoch clock read.
+    # Windows replayed back to back mostly share a second, so the part down
+    # to seconds is formatted once per second and only the fraction per call.
+    global _last_iso_sec
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _last_iso_sec
+    if sec != cached_sec:
+        t = time.gmtime(sec)
+        prefix = (
+            f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+            f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        )
+        _last_iso_sec = (sec, prefix)
+    return f"{prefix}.{us:06d}Z"
+
+
 class GrooveLayer:
     """
     Groove Layer v0 engine.
@@ -82,7 +285,7 @@ class GrooveLayer:
         if "last_density" in hint:
             self.state.last_density = DensityTarget(hint["last_density"])
         # Imply we were unstable if we were in micro_loop
-        if self.state.last_loop_policy == LoopPolicy.micro_loop:
+        if self.state.last_loop_policy == _LOOP_MICRO:
             self.state.consecutive_unstable_windows = 1
     
     def _compute_controls(
@@ -98,213 +301,63 @@ class GrooveLayer:
         2. Unstable → reduce density, micro-loop, disable probing
         3. Stable → follow player, allow probing
         """
+        key = self._policy_key(stats, engine_context)
+        controls = _clone_controls(_POLICY_TABLE[key])
+        if key in _FEEL_FROM_CONTEXT:
+            feel = controls["feel"]
+            feel["feel_policy"] = engine_context.feel
+            feel["grid"] = engine_context.grid
+        return controls
+    
+    def _policy_key(
+        self,
+        stats: WindowStats,
+        engine_context: Optional[EngineContext],
+    ) -> str:
+        """Pick the _POLICY_TABLE entry for this window and update hysteresis counters."""
+        state = self.state
         # Case 1: Missing engine context — freeze and stay conservative
         if engine_context is None:
-            return self._frozen_controls()
+            return "frozen"
         
         # Case 2: Unstable window — degradation behavior
         if not stats.is_stable:
-            self.state.consecutive_unstable_windows += 1
-            self.state.consecutive_stable_windows = 0
-            return self._unstable_controls(stats)
+            state.consecutive_unstable_windows += 1
+            state.consecutive_stable_windows = 0
+            return "unstable"
         
         # Case 3: Stable window — check for recovery or baseline
-        self.state.consecutive_stable_windows += 1
-        self.state.consecutive_unstable_windows = 0
+        state.consecutive_stable_windows += 1
+        state.consecutive_unstable_windows = 0
         
-        # Recovery: was unstable, now stable
-        if self.state.last_loop_policy == LoopPolicy.micro_loop:
-            return self._recovery_controls(stats, engine_context)
+        # Recovery: was unstable, now stable. Use hysteresis: require multiple
+        # stable windows before full recovery.
+        if (
+            state.last_loop_policy == _LOOP_MICRO
+            and state.consecutive_stable_windows < self.config.windows_to_confirm_stability
+        ):
+            return "recovery"
         
-        # Baseline stable: follow player
-        return self._stable_controls(stats, engine_context)
-    
-    def _frozen_controls(self) -> Dict[str, Any]:
-        """Controls when engine context is missing — fail boringly."""
-        return {
-            "tempo": {
-                "policy": TempoPolicy.steady_clock.value,
-                "nudge_strength": 0.0,
-                "max_delta_pct_per_min": 0,
-            },
-            "arrangement": {
-                "density_target": DensityTarget.medium.value,
-                "instrumentation_policy": "keep_layers",
-                "dynamics_follow": "fixed",
-            },
-            "loop": {
-                "policy": LoopPolicy.none.value,
-                "length_bars": 4,
-                "exit_condition": "manual",
-            },
-            "feel": {
-                "feel_policy": "straight",
-                "grid": "quarter",  # conservative, no grid claims
-                "click_policy": "off",
-            },
-            "assist": {
-                "assist_policy": AssistPolicy.minimal.value,
-                "ghost_drums": "off",
-                "count_in_bars": 0,
-            },
-            "change_policy": {
-                "allow_modulation": False,
-                "allow_tempo_change_events": False,
-                "allow_density_probes": False,
-            },
-            "_rationale": {
-                "trigger": "missing_context",
-                "notes": "No engine context; freezing corrective behavior to avoid wrong claims.",
-            },
-        }
-    
-    def _unstable_controls(self, stats: WindowStats) -> Dict[str, Any]:
-        """Controls when player is unstable — support and simplify."""
-        return {
-            "tempo": {
-                "policy": TempoPolicy.steady_clock.value,
-                "nudge_strength": 0.4,
-                "max_delta_pct_per_min": 3,
-            },
-            "arrangement": {
-                "density_target": DensityTarget.sparse.value,
-                "instrumentation_policy": "reduce_layers",
-                "dynamics_follow": "fixed",
-            },
-            "loop": {
-                "policy": LoopPolicy.micro_loop.value,
-                "length_bars": 4,
-                "exit_condition": "stability_recovered",
-            },
-            "feel": {
-                "feel_policy": "straight",
-                "grid": "eighth",
-                "click_policy": "prominent",
-            },
-            "assist": {
-                "assist_policy": AssistPolicy.supportive.value,
-                "ghost_drums": "light",
-                "count_in_bars": 2,
-            },
-            "change_policy": {
-                "allow_modulation": False,
-                "allow_tempo_change_events": False,
-                "allow_density_probes": False,
-            },
-            "_rationale": {
-                "trigger": "low_tempo_stability",
-                "notes": "Detected instability; simplifying and gating changes until stable.",
-            },
-        }
-    
-    def _recovery_controls(
-        self,
-        stats: WindowStats,
-        engine_context: EngineContext,
-    ) -> Dict[str, Any]:
-        """Controls when recovering from instability — de-escalate gradually."""
-        # Use hysteresis: require multiple stable windows before full recovery
-        if self.state.consecutive_stable_windows < self.config.windows_to_confirm_stability:
-            # Still in recovery, but improving
-            return {
-                "tempo": {
-                    "policy": TempoPolicy.follow_player.value,
-                    "nudge_strength": 0.25,
-                    "max_delta_pct_per_min": 5,
-                },
-                "arrangement": {
-                    "density_target": DensityTarget.medium.value,
-                    "instrumentation_policy": "keep_layers",
-                    "dynamics_follow": "soft_follow",
-                },
-                "loop": {
-                    "policy": LoopPolicy.loop_section.value,
-                    "length_bars": 4,
-                    "exit_condition": "stability_recovered",
-                },
-                "feel": {
-                    "feel_policy": engine_context.feel,
-                    "grid": engine_context.grid,
-                    "click_policy": "subtle",
-                },
-                "assist": {
-                    "assist_policy": AssistPolicy.standard.value,
-                    "ghost_drums": "off",
-                    "count_in_bars": 0,
-                },
-                "change_policy": {
-                    "allow_modulation": False,
-                    "allow_tempo_change_events": True,
-                    "allow_density_probes": True,
-                },
-                "_rationale": {
-                    "trigger": "stability_recovering",
-                    "notes": "Stability recovered; relaxing assist and restoring density.",
-                },
-            }
-        
-        # Fully recovered
-        return self._stable_controls(stats, engine_context)
-    
-    def _stable_controls(
-        self,
-        stats: WindowStats,
-        engine_context: EngineContext,
-    ) -> Dict[str, Any]:
-        """Controls when player is stable — follow and allow exploration."""
-        return {
-            "tempo": {
-                "policy": TempoPolicy.follow_player.value,
-                "nudge_strength": 0.2,
-                "max_delta_pct_per_min": 5,
-            },
-            "arrangement": {
-                "density_target": DensityTarget.medium.value,
-                "instrumentation_policy": "keep_layers",
-                "dynamics_follow": "soft_follow",
-            },
-            "loop": {
-                "policy": LoopPolicy.none.value,
-                "length_bars": 4,
-                "exit_condition": "manual",
-            },
-            "feel": {
-                "feel_policy": engine_context.feel,
-                "grid": engine_context.grid,
-                "click_policy": "subtle",
-            },
-            "assist": {
-                "assist_policy": AssistPolicy.standard.value,
-                "ghost_drums": "off",
-                "count_in_bars": 1,
-            },
-            "change_policy": {
-                "allow_modulation": False,
-                "allow_tempo_change_events": True,
-                "allow_density_probes": True,
-            },
-            "_rationale": {
-                "trigger": "stable_baseline",
-                "notes": "Baseline stable play; no corrective action required.",
-            },
-        }
+        # Baseline stable (or fully recovered): follow player
+        return "stable"
     
     def _update_state(self, stats: WindowStats) -> None:
         """Update internal state after processing a window."""
-        self.state.last_window_stats = stats
+        state = self.state
+        state.last_window_stats = stats
         
         # Update hysteresis tracking
         if stats.is_stable:
-            self.state.last_density = DensityTarget.medium
-            if self.state.last_loop_policy == LoopPolicy.micro_loop:
-                self.state.last_loop_policy = LoopPolicy.loop_section
-            elif self.state.consecutive_stable_windows >= self.config.windows_to_confirm_stability:
-                self.state.last_loop_policy = LoopPolicy.none
-            self.state.last_tempo_policy = TempoPolicy.follow_player
+            state.last_density = _DENSITY_MEDIUM
+            if state.last_loop_policy == _LOOP_MICRO:
+                state.last_loop_policy = _LOOP_SECTION
+            elif state.consecutive_stable_windows >= self.config.windows_to_confirm_stability:
+                state.last_loop_policy = _LOOP_NONE
+            state.last_tempo_policy = _TEMPO_FOLLOW
         else:
-            self.state.last_density = DensityTarget.sparse
-            self.state.last_loop_policy = LoopPolicy.micro_loop
-            self.state.last_tempo_policy = TempoPolicy.steady_clock
+            state.last_density = _DENSITY_SPARSE
+            state.last_loop_policy = _LOOP_MICRO
+            state.last_tempo_policy = _TEMPO_STEADY
     
     def _build_output(
         self,
@@ -313,7 +366,7 @@ class GrooveLayer:
         engine_context: Optional[EngineContext],
     ) -> Dict[str, Any]:
         """Build the groove_layer_control_v0 output message."""
-        now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        now = _utc_now_iso()
         
         # Extract rationale before building controls
         rationale = controls.pop("_rationale", {"trigger": "unknown", "notes": ""})
@@ -353,7 +406,7 @@ def process_fixture(fixture: Dict[str, Any]) -> Dict[str, Any]:
     session_id = fixture["session_id"]
     
     engine_context = EngineContext.from_dict(fixture.get("engine_context"))
-    events = [PerformanceEvent.from_dict(e) for e in fixture.get("events", [])]
+    events = PerformanceEvent.batch_from_dicts(fixture.get("events", []))
     prior_state_hint = fixture.get("prior_state_hint")
     
     layer = GrooveLayer(device_id, session_id)
@@ -378,7 +431,7 @@ def process_multi_window_fixture(fixture: Dict[str, Any]) -> List[Dict[str, Any]
     results = []
     
     for window in fixture.get("windows", []):
-        events = [PerformanceEvent.from_dict(e) for e in window.get("events", [])]
+        events = PerformanceEvent.batch_from_dicts(window.get("events", []))
         result = layer.update_window(events, engine_context)
         result["_label"] = window.get("label", "")
         results.append(result)
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 
 class EventType(str, Enum):
@@ -17,6 +17,10 @@ class EventType(str, Enum):
     percussive_onset = "percussive_onset"
 
 
+# value -> member, skipping EnumMeta.__call__ on the batch decode path
+_EVENT_TYPE_BY_VALUE: Dict[str, EventType] = {e.value: e for e in EventType}
+
+
 class TempoPolicy(str, Enum):
     follow_player = "follow_player"
     steady_clock = "steady_clock"
@@ -41,7 +45,7 @@ class AssistPolicy(str, Enum):
     supportive = "supportive"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PerformanceEvent:
     """A single onset event from the extractor."""
     t_onset_ms: int
@@ -58,8 +62,23 @@ class PerformanceEvent:
             confidence=float(d["confidence"]),
         )
 
-
-@dataclass(frozen=True)
+    @classmethod
+    def batch_from_dicts(cls, ds: Iterable[Dict[str, Any]]) -> List[PerformanceEvent]:
+        """from_dict over a whole window of events, with lookups bound once."""
+        by_value = _EVENT_TYPE_BY_VALUE
+        return [
+            cls(
+                int(d["t_onset_ms"]),
+                # unknown values still go through EventType() for its ValueError
+                by_value.get(d["event_type"]) or EventType(d["event_type"]),
+                float(d["strength"]),
+                float(d["confidence"]),
+            )
+            for d in ds
+        ]
+
+
+@dataclass(frozen=True, slots=True)
 class EngineContext:
     """Context from the engine host (tempo, grid, feel)."""
     tempo_bpm_target: float
@@ -83,7 +102,7 @@ class EngineContext:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WindowStats:
     """Computed statistics for a single window."""
     event_count: int
@@ -115,7 +134,7 @@ class GrooveState:
     latents_v0: Dict[str, float] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GrooveLayerConfig:
     """Configuration knobs for the Groove Layer."""
     # Window parameters
@@ -6,8 +6,7 @@ No learning here—just evidence extraction.
 """
 from __future__ import annotations
 
-import statistics
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from .models import (
     GrooveLayerConfig,
@@ -16,6 +15,31 @@ from .models import (
 )
 
 
+def _interval_variance(onsets: Sequence[int]) -> float:
+    """
+    Sample variance of successive intervals of sorted int onsets (len >= 2).
+    
+    Kernel over plain ints only (both entry points coerce), no event
+    objects, no intervals list. Uses
+    var = (k*sum(d^2) - sum(d)^2) / (k*(k-1)) in exact integer arithmetic;
+    sum(d) telescopes to last - first, so one pass collects sum(d^2) and the
+    only rounding is the final division (same result as statistics.variance).
+    0.0 when there is a single interval.
+    """
+    k = len(onsets) - 1
+    if k < 2:
+        return 0.0
+    sum_sq = 0
+    it = iter(onsets)
+    prev = next(it)
+    for t in it:
+        d = t - prev
+        prev = t
+        sum_sq += d * d
+    span = onsets[-1] - onsets[0]
+    return (k * sum_sq - span * span) / (k * (k - 1))
+
+
 def compute_window_stats(
     events: List[PerformanceEvent],
     config: GrooveLayerConfig = GrooveLayerConfig(),
@@ -27,11 +51,86 @@ def compute_window_stats(
     - event_count
     - mean_confidence
     - window_confidence (gated by event count)
-    - onset_interval_variance_ms (stability proxy)
+    - onset_interval_variance_ms (stability proxy; inf when the count or
+      confidence gate already fails, since it cannot change is_stable)
     - is_stable (based on variance threshold)
+    
+    Events may arrive in any order. No precondition is needed for the usual
+    in-order window: the onsets are sorted as plain ints with list.sort,
+    which finishes in one linear run-detection pass on sorted input. That is
+    cheaper than any Python-level monotonicity check.
     """
     event_count = len(events)
     
+    # Tiny windows (sparse playing) skip the loop and list setup entirely
+    if event_count == 1:
+        e = events[0]
+        return _finish_stats(1, e.confidence, [e.t_onset_ms], config, onsets_owned=True)
+    if event_count == 2:
+        a, b = events
+        return _finish_stats(
+            2, a.confidence + b.confidence, [a.t_onset_ms, b.t_onset_ms], config, onsets_owned=True
+        )
+    
+    # One pass over the events: confidence sum plus the onsets as plain ints,
+    # so the sort below works on primitives instead of keyed event objects.
+    sum_conf = 0.0
+    onsets = [0] * event_count
+    for i, e in enumerate(events):
+        sum_conf += e.confidence
+        onsets[i] = e.t_onset_ms
+    
+    return _finish_stats(event_count, sum_conf, onsets, config, onsets_owned=True)
+
+
+def window_stats_from_columns(
+    onsets_ms: Sequence[int],
+    confidences: Sequence[float],
+    config: GrooveLayerConfig = GrooveLayerConfig(),
+    *,
+    onsets_sorted: bool = False,
+) -> WindowStats:
+    """
+    compute_window_stats for callers that already hold column data: onset
+    times and confidences of the same events, index-aligned. No event
+    objects are built, and neither sequence is modified.
+    
+    Onsets are coerced with int(), as PerformanceEvent.from_dict does, so the
+    variance kernel stays exact: float epoch-ms onsets would otherwise lose
+    the interval spread to cancellation (even going slightly negative).
+    
+    Pass onsets_sorted=True only when onsets_ms is known to be ascending
+    (e.g. checked at capture); the sort is then skipped. It is not verified:
+    unsorted input with this flag gives a wrong variance.
+    
+    Raises ValueError when the two columns differ in length.
+    """
+    if len(onsets_ms) != len(confidences):
+        raise ValueError("onsets_ms and confidences must have the same length")
+    # the int copy is ours, so it may be sorted in place
+    onsets = list(map(int, onsets_ms))
+    return _finish_stats(
+        len(onsets), sum(confidences), onsets, config, onsets_owned=True, onsets_sorted=onsets_sorted
+    )
+
+
+def _finish_stats(
+    event_count: int,
+    sum_conf: float,
+    onsets: Sequence[int],
+    config: GrooveLayerConfig,
+    *,
+    onsets_owned: bool = False,
+    onsets_sorted: bool = False,
+) -> WindowStats:
+    # onsets_owned: the caller built `onsets` for this call, so it may be
+    # sorted in place; onsets_sorted: already ascending, skip the sort
+    
+    # the three thresholds used below, read off the config once
+    min_events = config.min_events_per_window
+    low_conf = config.low_confidence_threshold
+    var_threshold = config.stability_variance_threshold_ms
+    
     # No events = maximally uncertain
     if event_count == 0:
         return WindowStats(
@@ -43,33 +142,43 @@ def compute_window_stats(
         )
     
     # Mean confidence of events
-    mean_confidence = sum(e.confidence for e in events) / event_count
+    mean_confidence = sum_conf / event_count
     
     # Gate confidence by event count
     # Below min_events, scale down confidence proportionally
-    count_factor = min(1.0, event_count / config.min_events_per_window)
+    count_factor = min(1.0, event_count / min_events)
     window_confidence = mean_confidence * count_factor
     
+    # Cheap gates first: a window short on events or confidence is unstable
+    # whatever its timing, so skip the sort and variance for it.
+    if (
+        event_count < min_events
+        or window_confidence < low_conf
+    ):
+        return WindowStats(
+            event_count=event_count,
+            mean_confidence=mean_confidence,
+            window_confidence=window_confidence,
+            onset_interval_variance_ms=float("inf"),
+            is_stable=False,
+        )
+    
     # Compute onset interval variance (stability proxy)
     if event_count < 2:
         onset_interval_variance_ms = float("inf")
+    elif event_count == 2:
+        # a single interval has no spread
+        onset_interval_variance_ms = 0.0
     else:
-        sorted_events = sorted(events, key=lambda e: e.t_onset_ms)
-        intervals = [
-            sorted_events[i + 1].t_onset_ms - sorted_events[i].t_onset_ms
-            for i in range(len(sorted_events) - 1)
-        ]
-        if len(intervals) >= 2:
-            onset_interval_variance_ms = statistics.variance(intervals)
-        else:
-            onset_interval_variance_ms = 0.0
+        if not onsets_sorted:
+            if onsets_owned:
+                onsets.sort()
+            else:
+                onsets = sorted(onsets)
+        onset_interval_variance_ms = _interval_variance(onsets)
     
     # Determine stability
-    is_stable = (
-        event_count >= config.min_events_per_window
-        and window_confidence >= config.low_confidence_threshold
-        and onset_interval_variance_ms <= config.stability_variance_threshold_ms
-    )
+    is_stable = onset_interval_variance_ms <= var_threshold
     
     return WindowStats(
         event_count=event_count,
@@ -0,0 +1,39 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+import runtime.engine
+import runtime.store
+
+
+def _stdlib_jsonutil():
+    """runtime._jsonutil as imported on an install without orjson."""
+    path = Path(runtime.store.__file__).with_name("_jsonutil.py")
+    spec = importlib.util.spec_from_file_location("runtime._jsonutil_stdlib", path)
+    module = importlib.util.module_from_spec(spec)
+    saved = sys.modules.get("orjson")
+    sys.modules["orjson"] = None  # makes `import orjson` raise ImportError
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        if saved is None:
+            del sys.modules["orjson"]
+        else:
+            sys.modules["orjson"] = saved
+    return module
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    """Runs a test once per JSON backend, with the runtime wired to it."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        import runtime._jsonutil as backend
+    else:
+        backend = _stdlib_jsonutil()
+    monkeypatch.setattr(runtime.store, "_dumps", backend.dumps)
+    monkeypatch.setattr(runtime.store, "_loads", backend.loads)
+    monkeypatch.setattr(runtime.engine, "loads", backend.loads)
+    return backend
@@ -0,0 +1,22 @@
+import io
+from pathlib import Path
+from runtime.attachments import put_blob, put_blob_path, sha256_bytes, sha256_stream
+
+
+def test_sha256_stream_matches_bytes():
+    blob = b"\x00\x01" * 300_000
+    assert sha256_stream(io.BytesIO(blob)) == sha256_bytes(blob)
+
+
+def test_put_blob_path_moves_into_store(tmp_path: Path):
+    blob = b"take-audio"
+    src = tmp_path / "capture.wav"
+    src.write_bytes(blob)
+
+    sha, path = put_blob_path(tmp_path / "data", src, ".wav")
+    assert sha == sha256_bytes(blob)
+    assert path.read_bytes() == blob
+    assert not src.exists()
+
+    # same content via put_blob lands on the same path
+    assert put_blob(tmp_path / "data", blob, "wav") == (sha, path)
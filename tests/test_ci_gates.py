@@ -0,0 +1,209 @@
+"""
+Tests for the CI gate scripts under scripts/ci, imported from their files.
+
+Validates:
+- contracts governance: stem matching and added-line extraction as the gate
+  itself runs them (tests/test_stem_match.py covers the matching rules)
+- contracts governance: CHANGELOG check end to end on a scratch git repo
+- contracts governance: stream_git survives git filling its stderr
+- toolbox terms: the byte pre-check never hides a regex match
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+CI_DIR = Path(__file__).parent.parent / "scripts" / "ci"
+
+
+def _load_script(name: str):
+    spec = importlib.util.spec_from_file_location(name, CI_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+gov = _load_script("check_contracts_governance")
+toolbox = _load_script("check_no_toolbox_terms")
+
+needs_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _reference_missing(text: str, stems):
+    """The per-stem loop _missing_stems replaced."""
+    return [
+        s for s in stems
+        if re.search(rf"(?<![A-Za-z0-9_]){re.escape(s)}(?![A-Za-z0-9_])", text) is None
+    ]
+
+
+class TestMissingStems:
+    def test_overlapping_stems_are_both_found(self):
+        # one alternation pass reports "a-b" at position 0, never "a" inside it
+        assert gov._missing_stems("- a-b: new field", ["a", "a-b"]) == []
+        assert gov._missing_stems("- a-b: new field", ["a", "a-b", "b"]) == []
+
+    def test_substring_only_hits_stay_missing(self):
+        assert gov._missing_stems("cam_policy_extended, xqa_core", ["cam_policy", "qa_core"]) == [
+            "cam_policy", "qa_core",
+        ]
+
+    def test_single_and_no_hit_paths(self):
+        assert gov._missing_stems("nothing relevant", ["qa_core", "cam_policy"]) == ["qa_core", "cam_policy"]
+        assert gov._missing_stems("- qa_core: docs", ["qa_core", "cam_policy"]) == ["cam_policy"]
+        assert gov._missing_stems("- qa_core2: docs", ["qa_core"]) == ["qa_core"]
+
+    def test_matches_per_stem_loop(self):
+        rng = random.Random(0)
+        alphabet = "ab-_. "
+        for _ in range(2000):
+            stems = sorted({"".join(rng.choice("ab-") for _ in range(rng.randint(1, 4))) for _ in range(4)})
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+            assert gov._missing_stems(text, stems) == _reference_missing(text, stems), (text, stems)
+
+
+class TestIterAddedLines:
+    def test_added_lines_only(self):
+        diff = [
+            "diff --git a/contracts/CHANGELOG.md b/contracts/CHANGELOG.md\n",
+            "--- a/contracts/CHANGELOG.md\n",
+            "+++ b/contracts/CHANGELOG.md\n",
+            "@@ -1,2 +1,3 @@\n",
+            " ## Unreleased\n",
+            "-- cam_policy: old\n",
+            "+- cam_policy: new\n",
+            "++ double plus\n",
+            "+",
+        ]
+        assert list(gov._iter_added_lines(diff)) == ["- cam_policy: new", "+ double plus", ""]
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout
+
+
+@pytest.fixture
+def contracts_repo(tmp_path: Path) -> Path:
+    """Scratch repo: `base` branch with two schemas, HEAD on `work` off it."""
+    repo = tmp_path
+    _git(repo, "init", "-q", "-b", "base")
+    contracts = repo / "contracts"
+    contracts.mkdir()
+    for name in ("qa_core", "cam_policy"):
+        (contracts / f"{name}.schema.json").write_text("{}\n")
+    (contracts / "CHANGELOG.md").write_text("## Unreleased\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "base")
+    _git(repo, "checkout", "-q", "-b", "work")
+    return repo
+
+
+@needs_git
+class TestCheckChangelog:
+    def _change(self, repo: Path, changelog_lines):
+        for name in ("qa_core", "cam_policy"):
+            (repo / "contracts" / f"{name}.schema.json").write_text('{"type": "object"}\n')
+        with open(repo / "contracts" / "CHANGELOG.md", "a") as fh:
+            fh.writelines(ln + "\n" for ln in changelog_lines)
+        _git(repo, "commit", "-q", "-am", "work")
+        return gov.changed_files(repo, "base")
+
+    def test_every_stem_mentioned_passes(self, contracts_repo: Path):
+        changed = self._change(contracts_repo, ["- qa_core: docs", "- cam_policy: range"] + ["filler"] * 50)
+
+        assert gov.check_changelog(contracts_repo, changed, "base") == []
+
+    def test_missing_stem_is_reported(self, contracts_repo: Path):
+        changed = self._change(contracts_repo, ["- qa_core: docs", "- cam_policy_extended: range"])
+
+        (v,) = gov.check_changelog(contracts_repo, changed, "base")
+        assert v.code == "CHANGELOG_MISSING_MENTIONS"
+        assert v.message.endswith(": cam_policy")
+
+
+@needs_git
+def test_changed_files_matches_git_name_only(contracts_repo: Path):
+    contracts = contracts_repo / "contracts"
+    (contracts / "qa_core.schema.json").write_text('{"type": "object"}\n')  # edit
+    (contracts / "CHANGELOG.md").unlink()  # delete
+    _git(contracts_repo, "mv", "contracts/cam_policy.schema.json", "contracts/cam_rules.schema.json")  # rename
+    _git(contracts_repo, "commit", "-q", "-am", "work")
+
+    expected = _git(contracts_repo, "diff", "--name-only", "base...HEAD").splitlines()
+    assert gov.changed_files(contracts_repo, "base") == expected
+    assert "contracts/cam_rules.schema.json" in expected
+
+@pytest.mark.skipif(os.name == "nt", reason="fake git is a POSIX script")
+def test_stream_git_does_not_deadlock_on_large_stderr(tmp_path: Path, monkeypatch):
+    # more stderr than a pipe buffer holds, written before any stdout
+    fake = tmp_path / "git"
+    fake.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "sys.stderr.write('warning: noise\\n' * 16384 + 'fatal: bad revision\\n')\n"
+        "sys.stderr.flush()\n"
+        "print('line')\n"
+        "sys.exit(128)\n"
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    result = {}
+
+    def run():
+        lines = []
+        try:
+            for ln in gov.stream_git(["diff"], cwd=tmp_path):
+                lines.append(ln)
+        except RuntimeError as e:
+            result["error"] = str(e)
+        result["lines"] = lines
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    t.join(timeout=30)
+    assert not t.is_alive(), "stream_git deadlocked"
+    assert result["lines"] == ["line\n"]
+    assert result["error"].endswith("fatal: bad revision")
+
+
+class TestNoToolboxTerms:
+    def _run(self, tmp_path: Path, monkeypatch, content: bytes) -> int:
+        contracts = tmp_path / "contracts"
+        contracts.mkdir(exist_ok=True)
+        (contracts / "a.json").write_bytes(content)
+        monkeypatch.setattr(sys, "argv", ["check_no_toolbox_terms.py", "--repo-root", str(tmp_path)])
+        return toolbox.main()
+
+    @pytest.mark.parametrize("word", ["spindle", "CAM", "ſpindle", "fıxture", "FİXTURE"])
+    def test_blocked_terms_fail(self, tmp_path: Path, monkeypatch, word: str):
+        assert self._run(tmp_path, monkeypatch, f'{{"note": "{word}"}}'.encode("utf-8")) == 1
+
+    @pytest.mark.parametrize("text", ['{"note": "camera"}', '{"note": "café camshaft"}'])
+    def test_non_matches_pass(self, tmp_path: Path, monkeypatch, text: str):
+        assert self._run(tmp_path, monkeypatch, text.encode("utf-8")) == 0
+
+    @pytest.mark.skipif(os.name == "nt", reason="symlinks need privileges on Windows")
+    def test_symlinked_file_is_scanned(self, tmp_path: Path, monkeypatch):
+        outside = tmp_path / "outside.md"
+        outside.write_text("toolpath notes\n")
+        (tmp_path / "contracts").mkdir()
+        (tmp_path / "contracts" / "notes.md").symlink_to(outside)
+
+        assert self._run(tmp_path, monkeypatch, b"{}") == 1
+
+    def test_needles_match_patterns(self):
+        assert toolbox.BLOCKED == [rf"\b{t}\b" for t in toolbox.BLOCKED_TERMS]
+        assert all(t.decode() in toolbox.BLOCKED_TERMS for t in toolbox._BLOCKED_BYTES)
@@ -49,6 +49,8 @@ def test_evaluate_session_prefers_step_hotspot_focus():
     ev = evaluate_session(s)
     assert ev.focus_recommendation.concept == "grid_alignment"
     assert any("step 7/16" in f.interpretation for f in ev.findings)
+    assert ev.focus_recommendation.reason == "Highest hotspot at step 7/16 (~32.0 ms)."
+    assert "Hotspot at step 3/16." in ev.weaknesses
 
 
 def test_evaluate_session_uses_timing_foundation_when_mean_high():
@@ -73,3 +75,20 @@ def test_evaluate_session_records_late_drops_as_info_finding():
     ev = evaluate_session(s)
     assert any(f.type == "consistency" for f in ev.findings)
     assert any("Late-drops" in f.interpretation for f in ev.findings)
+
+
+def test_evaluate_session_dedupes_weaknesses_in_first_seen_order():
+    # "07" and "7" are the same step, so its hotspot is reported twice before dedupe
+    s = _base_session(
+        performance=PerformanceSummary(
+            bars_played=8,
+            notes_expected=100,
+            notes_played=100,
+            notes_dropped=0,
+            timing_error_ms=TimingErrorStats(mean=10.0, std=4.0, max=40.0),
+            error_by_step={"07": 30.0, "7": 32.0, "3": 18.0},
+        )
+    )
+    ev = evaluate_session(s)
+    assert ev.weaknesses == ["Hotspot at step 7/16.", "Hotspot at step 3/16."]
+    assert ev.strengths == ["Timing mean error is low.", "No late-drop events."]
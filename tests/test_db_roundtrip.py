@@ -1,7 +1,8 @@
 import json
+import sqlite3
 from pathlib import Path
 from runtime.db import connect, migrate
-from runtime.store import upsert_catalog, CatalogItem, list_catalog
+from runtime.store import upsert_catalog, CatalogItem, list_catalog, list_sessions, recent_seen_content_ids, save_session
 
 
 def test_catalog_roundtrip(tmp_path: Path):
@@ -17,3 +18,130 @@ def test_catalog_roundtrip(tmp_path: Path):
     items = list_catalog(con)
     assert len(items) == 1
     assert items[0]["content_id"] == "drill_alt_picking_1"
+
+
+def test_catalog_batch_upsert_is_one_transaction(tmp_path: Path):
+    con = connect(tmp_path / "x.sqlite3")
+    migrate(con)
+
+    def items(title: str):
+        return [
+            CatalogItem(content_id=f"drill_{i:03d}", kind="drill", title=f"{title} {i:03d}",
+                        summary="s", tags=["t"], updated_at_utc="2026-01-01T00:00:00Z")
+            for i in range(200)
+        ]
+
+    upsert_catalog(con, "2026-01-01T00:00:00Z", items("Drill"))
+    trace = []
+    con.set_trace_callback(trace.append)
+    upsert_catalog(con, "2026-01-02T00:00:00Z", items("Renamed"))
+    con.set_trace_callback(None)
+
+    assert sum(1 for t in trace if t.strip().upper() == "COMMIT") == 1
+    rows = list_catalog(con)
+    assert len(rows) == 200
+    assert all(r["title"].startswith("Renamed") for r in rows)
+    assert {r["updated_at_utc"] for r in rows} == {"2026-01-02T00:00:00Z"}
+
+
+def test_migrate_is_idempotent(tmp_path: Path):
+    con = connect(tmp_path / "x.sqlite3")
+    migrate(con)
+    migrate(con)
+
+    rows = con.execute("SELECT v FROM meta WHERE k='schema_version'").fetchall()
+    assert [r["v"] for r in rows] == ["v1"]
+
+
+def test_recent_session_lookup_uses_learner_index(tmp_path: Path):
+    con = connect(tmp_path / "x.sqlite3")
+    migrate(con)
+
+    plan = con.execute(
+        "EXPLAIN QUERY PLAN SELECT session_json FROM sessions "
+        "WHERE device_learner_id=? ORDER BY started_at_utc DESC LIMIT 20",
+        ("lrn_x",),
+    ).fetchall()
+    details = " ".join(r["detail"] for r in plan)
+    assert "idx_sessions_lrn_started" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_recent_seen_content_ids_limits_sessions(tmp_path: Path):
+    con = connect(tmp_path / "x.sqlite3")
+    migrate(con)
+
+    with con:
+        for i, cid in enumerate(["drill_old", "drill_a", "drill_b"]):
+            ts = f"2026-01-0{i + 1}T00:00:00Z"
+            save_session(con, f"ses_{i}", "lrn_x", ts, ts, None,
+                         {"attempts": [{"content_id": cid}, {"summary": {}}]})
+        save_session(con, "ses_other", "lrn_y", "2026-01-09T00:00:00Z", "2026-01-09T00:00:00Z", None,
+                     {"attempts": [{"content_id": "drill_y"}]})
+
+    assert recent_seen_content_ids(con, "lrn_x", limit=2) == {"drill_a", "drill_b"}
+    assert recent_seen_content_ids(con, "lrn_z") == set()
+
+
+def test_recent_seen_content_ids_tolerates_non_strict_rows(tmp_path: Path):
+    # json.dumps writes NaN for float metrics; SQLite's json_each rejects it
+    con = connect(tmp_path / "x.sqlite3")
+    migrate(con)
+
+    with con:
+        con.execute(
+            "INSERT INTO sessions(session_id, device_learner_id, started_at_utc, ended_at_utc, session_json)"
+            " VALUES ('ses_nan', 'lrn_x', '2026-01-01T00:00:00Z', '2026-01-01T00:00:00Z', ?)",
+            ('{"attempts": [{"content_id": "drill_nan", "timing_error_ms_p95": NaN}]}',),
+        )
+        save_session(con, "ses_ok", "lrn_x", "2026-01-02T00:00:00Z", "2026-01-02T00:00:00Z", None,
+                     {"attempts": [{"content_id": "drill_ok"}]})
+
+    assert recent_seen_content_ids(con, "lrn_x") == {"drill_nan", "drill_ok"}
+
+
+def test_list_sessions_newest_first(tmp_path: Path):
+    con = connect(tmp_path / "x.sqlite3")
+    migrate(con)
+
+    with con:
+        for i in range(3):
+            ts = f"2026-01-0{i + 1}T00:00:00Z"
+            save_session(con, f"ses_{i}", "lrn_x", ts, ts, None, {"session_id": f"ses_{i}"})
+
+    assert [s["session_id"] for s in list_sessions(con, "lrn_x", limit=2)] == ["ses_2", "ses_1"]
+
+
+def test_migrate_skips_ddl_when_current(tmp_path: Path):
+    db = tmp_path / "x.sqlite3"
+    migrate(connect(db))
+
+    con = connect(db)
+    statements = []
+    con.set_trace_callback(statements.append)
+    migrate(con)
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_migrate_rebuilds_legacy_tables(tmp_path: Path):
+    db = tmp_path / "x.sqlite3"
+    con = sqlite3.connect(str(db))
+    con.executescript(
+        """
+        CREATE TABLE meta (k TEXT PRIMARY KEY, v TEXT NOT NULL);
+        INSERT INTO meta VALUES ('schema_version', 'v1');
+        CREATE TABLE catalog (content_id TEXT PRIMARY KEY, kind TEXT NOT NULL, title TEXT NOT NULL,
+                              summary TEXT, tags_json TEXT NOT NULL, updated_at_utc TEXT NOT NULL);
+        INSERT INTO catalog VALUES ('drill_a', 'drill', 'A', NULL, '[]', '2026-01-01T00:00:00Z');
+        """
+    )
+    con.close()
+
+    con = connect(db)
+    migrate(con)
+
+    sql = con.execute("SELECT sql FROM sqlite_master WHERE name='catalog'").fetchone()["sql"]
+    assert "WITHOUT ROWID" in sql
+    assert [c["content_id"] for c in list_catalog(con)] == ["drill_a"]
+    assert con.execute("SELECT count(*) FROM sqlite_master WHERE name LIKE '_legacy_%'").fetchone()[0] == 0
+    assert con.execute("SELECT count(*) FROM sqlite_master WHERE name='idx_sessions_lrn_started'").fetchone()[0] == 1
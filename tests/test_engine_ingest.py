@@ -0,0 +1,114 @@
+import json
+import sqlite3
+from pathlib import Path
+from runtime.config import RuntimeConfig
+from runtime.engine import compute_assignment, ingest_session, ingest_session_raw
+from runtime.identity import device_learner_id, ensure_device_identity
+from runtime.db import connect
+from runtime.store import list_sessions
+
+
+def _cfg(tmp_path: Path) -> RuntimeConfig:
+    return RuntimeConfig(
+        data_dir=tmp_path,
+        db_path=tmp_path / "sgc.sqlite3",
+        device_secret_path=tmp_path / "device_secret.bin",
+    )
+
+
+def _stored_text(cfg: RuntimeConfig, session_id: str) -> str:
+    con = sqlite3.connect(str(cfg.db_path))
+    row = con.execute("SELECT session_json FROM sessions WHERE session_id=?", (session_id,)).fetchone()
+    con.close()
+    return row[0]
+
+
+def test_ingest_raw_stores_complete_payload(tmp_path: Path):
+    cfg = _cfg(tmp_path)
+    lrn = device_learner_id(ensure_device_identity(cfg.device_secret_path), 1)
+    raw = (
+        '{"session_id": "ses_1",  "device_learner_id": "%s", '
+        '"started_at_utc": "2026-01-01T00:00:00Z", "ended_at_utc": "2026-01-01T00:10:00Z", "attempts": []}' % lrn
+    ).encode("utf-8")
+
+    out = ingest_session_raw(cfg, raw)
+    assert out["stored_session_id"] == "ses_1"
+    assert json.loads(_stored_text(cfg, "ses_1")) == json.loads(raw)
+
+
+def test_ingest_raw_duplicate_keys_cannot_hide_a_foreign_id(tmp_path: Path, json_backend):
+    # Python keeps the last duplicate, SQLite's json_extract the first: the
+    # stored document must hold only the values the row columns were built from
+    cfg = _cfg(tmp_path)
+    lrn = device_learner_id(ensure_device_identity(cfg.device_secret_path), 1)
+    raw = (
+        '{"session_id": "ses_other", "device_learner_id": "lrn_other", '
+        '"started_at_utc": "2026-01-01T00:00:00Z", "ended_at_utc": "2026-01-01T00:10:00Z", '
+        '"attempts": [], "device_learner_id": "%s", "session_id": "ses_dup"}' % lrn
+    ).encode("utf-8")
+
+    assert ingest_session_raw(cfg, raw)["stored_session_id"] == "ses_dup"
+    con = sqlite3.connect(str(cfg.db_path))
+    rows = con.execute(
+        "SELECT session_id, device_learner_id, json_extract(session_json, '$.session_id'),"
+        " json_extract(session_json, '$.device_learner_id') FROM sessions"
+    ).fetchall()
+    con.close()
+    assert rows == [("ses_dup", lrn, "ses_dup", lrn)]
+
+
+def test_ingest_raw_patches_foreign_learner_id(tmp_path: Path):
+    cfg = _cfg(tmp_path)
+    raw = b'{"session_id": "ses_2", "device_learner_id": "lrn_other", "attempts": []}'
+
+    ingest_session_raw(cfg, raw)
+    stored = json.loads(_stored_text(cfg, "ses_2"))
+    assert stored["device_learner_id"] != "lrn_other"
+    assert stored["started_at_utc"]
+
+    # dict entrypoint normalizes the same way
+    out = ingest_session(cfg, {"session_id": "ses_3", "attempts": []})
+    assert json.loads(_stored_text(cfg, "ses_3"))["device_learner_id"] == stored["device_learner_id"]
+    assert out["coach_feedback"]["feedback"]["rubric_tags"] == ["no_data"]
+
+
+def test_nan_metric_does_not_break_next_assignment(tmp_path: Path):
+    cfg = _cfg(tmp_path)
+    ingest_session(cfg, {"session_id": "ses_nan", "attempts": [
+        {"content_id": "drill_x", "timing_error_ms_p95": float("nan")}
+    ]})
+
+    assert compute_assignment(cfg)["schema_id"] == "assignment"
+
+
+def _complete_session(cfg: RuntimeConfig, session_id: str, extra: str = "") -> str:
+    lrn = device_learner_id(ensure_device_identity(cfg.device_secret_path), 1)
+    return (
+        '{"session_id": "%s", "device_learner_id": "%s", "started_at_utc": "2026-01-01T00:00:00Z", '
+        '"ended_at_utc": "2026-01-01T00:10:00Z", "attempts": [{"content_id": "drill_x"%s}]}' % (session_id, lrn, extra)
+    )
+
+
+def test_ingest_raw_bom_and_utf16_are_stored_strict(tmp_path: Path, json_backend):
+    cfg = _cfg(tmp_path)
+    text = _complete_session(cfg, "ses_bom")
+    ingest_session_raw(cfg, b"\xef\xbb\xbf" + text.encode("utf-8"))
+    ingest_session_raw(cfg, _complete_session(cfg, "ses_u16").encode("utf-16"))
+
+    for sid in ("ses_bom", "ses_u16"):
+        assert not _stored_text(cfg, sid).startswith("\ufeff")
+        assert json.loads(_stored_text(cfg, sid))["session_id"] == sid
+    con = sqlite3.connect(str(cfg.db_path))
+    assert con.execute("SELECT count(*) FROM sessions WHERE json_valid(session_json)").fetchone() == (2,)
+    con.close()
+    lrn = json.loads(text)["device_learner_id"]
+    assert len(list_sessions(connect(cfg.db_path), lrn)) == 2
+    assert compute_assignment(cfg)["schema_id"] == "assignment"
+
+
+def test_ingest_raw_nan_metric_is_stored_as_null(tmp_path: Path, json_backend):
+    cfg = _cfg(tmp_path)
+    ingest_session_raw(cfg, _complete_session(cfg, "ses_nan", ', "timing_error_ms_p95": NaN').encode("utf-8"))
+
+    stored = json.loads(_stored_text(cfg, "ses_nan"))
+    assert stored["attempts"][0]["timing_error_ms_p95"] is None
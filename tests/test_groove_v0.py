@@ -10,54 +10,91 @@ Validates:
 """
 from __future__ import annotations
 
+import copy
 import json
+import statistics
+import subprocess
+import sys
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
 
-from sg_groove import GrooveLayer, PerformanceEvent, EngineContext
+try:  # optional C parser (the "fast" extra); same dict tree as json.loads
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+from sg_groove import PerformanceEvent, compute_window_stats, window_stats_from_columns
 from sg_groove.groove_layer import process_fixture, process_multi_window_fixture
 
 
 FIXTURES_DIR = Path(__file__).parent.parent / "fixtures" / "groove_v0"
 
 
+# Each fixture file is parsed once per session; the returned dicts are shared,
+# so tests must treat them as read-only.
+@lru_cache(maxsize=None)
 def load_vector(name: str) -> dict:
-    return json.loads((FIXTURES_DIR / "vectors" / f"{name}.json").read_text())
+    return _loads((FIXTURES_DIR / "vectors" / f"{name}.json").read_bytes())
 
 
+@lru_cache(maxsize=None)
 def load_expected(name: str) -> dict:
-    return json.loads((FIXTURES_DIR / "expected" / f"{name}.json").read_text())
+    return _loads((FIXTURES_DIR / "expected" / f"{name}.json").read_bytes())
 
 
+@lru_cache(maxsize=None)
 def load_assertions() -> dict:
-    return json.loads((FIXTURES_DIR / "acceptance" / "assertions.json").read_text())
+    return _loads((FIXTURES_DIR / "acceptance" / "assertions.json").read_bytes())
+
+
+@lru_cache(maxsize=256)
+def _compile_path(path: str):
+    """Accessor for a dotted path; the split happens once per distinct path."""
+    parts = tuple(path.split("."))
+
+    def get(obj):
+        for part in parts:
+            if not isinstance(obj, dict):
+                return None
+            obj = obj.get(part)
+        return obj
+
+    return get
+
+
+@lru_cache(maxsize=None)
+def _processed(vector_name: str):
+    """Output of a vector, computed once; shared, so read-only like the loaders."""
+    # Keyed on the name rather than a hash of the vector's content: load_vector
+    # is itself cached, so a name always maps to the same parsed dict.
+    vector = load_vector(vector_name)
+    if "windows" in vector:
+        return process_multi_window_fixture(vector)
+    return process_fixture(vector)
 
 
 class TestVector02UnstableMicroLoop:
     """Vector 02: Unstable burst → reduce density, micro-loop, disable probes."""
     
     def test_reduces_density_on_instability(self):
-        vector = load_vector("02_unstable_reduce_density_micro_loop")
-        result = process_fixture(vector)
+        result = _processed("02_unstable_reduce_density_micro_loop")
         
         assert result["controls"]["arrangement"]["density_target"] == "sparse"
     
     def test_engages_micro_loop_on_instability(self):
-        vector = load_vector("02_unstable_reduce_density_micro_loop")
-        result = process_fixture(vector)
+        result = _processed("02_unstable_reduce_density_micro_loop")
         
         assert result["controls"]["loop"]["policy"] == "micro_loop"
     
     def test_disables_probes_during_instability(self):
-        vector = load_vector("02_unstable_reduce_density_micro_loop")
-        result = process_fixture(vector)
+        result = _processed("02_unstable_reduce_density_micro_loop")
         
         assert result["controls"]["change_policy"]["allow_density_probes"] is False
     
     def test_uses_steady_clock_on_instability(self):
-        vector = load_vector("02_unstable_reduce_density_micro_loop")
-        result = process_fixture(vector)
+        result = _processed("02_unstable_reduce_density_micro_loop")
         
         assert result["controls"]["tempo"]["policy"] == "steady_clock"
 
@@ -66,72 +103,97 @@ class TestVector04MissingContext:
     """Vector 04: Missing tempo/context → freeze, no grid claims, no probes."""
     
     def test_freezes_tempo_on_missing_context(self):
-        vector = load_vector("04_missing_tempo_freeze_conservative")
-        result = process_fixture(vector)
+        result = _processed("04_missing_tempo_freeze_conservative")
         
         assert result["controls"]["tempo"]["policy"] == "steady_clock"
         assert result["controls"]["tempo"]["nudge_strength"] == 0.0
         assert result["controls"]["tempo"]["max_delta_pct_per_min"] == 0
     
     def test_disables_probes_on_missing_context(self):
-        vector = load_vector("04_missing_tempo_freeze_conservative")
-        result = process_fixture(vector)
+        result = _processed("04_missing_tempo_freeze_conservative")
         
         assert result["controls"]["change_policy"]["allow_density_probes"] is False
     
     def test_no_tempo_changes_on_missing_context(self):
-        vector = load_vector("04_missing_tempo_freeze_conservative")
-        result = process_fixture(vector)
+        result = _processed("04_missing_tempo_freeze_conservative")
         
         assert result["controls"]["change_policy"]["allow_tempo_change_events"] is False
 
 
+def _scribble(obj) -> None:
+    """Overwrite every scalar inside nested dicts/lists, in place."""
+    items = obj.items() if isinstance(obj, dict) else enumerate(obj)
+    for k, v in list(items):
+        if isinstance(v, (dict, list)):
+            _scribble(v)
+        else:
+            obj[k] = "mutated"
+
+
 class TestVector01StableBaseline:
     """Vector 01: Stable timing → follow player, no loop."""
     
     def test_follows_player_when_stable(self):
-        vector = load_vector("01_stable_follow_player")
-        result = process_fixture(vector)
+        result = _processed("01_stable_follow_player")
         
         assert result["controls"]["tempo"]["policy"] == "follow_player"
     
     def test_no_loop_when_stable(self):
-        vector = load_vector("01_stable_follow_player")
-        result = process_fixture(vector)
+        result = _processed("01_stable_follow_player")
         
         assert result["controls"]["loop"]["policy"] == "none"
     
     def test_medium_density_when_stable(self):
-        vector = load_vector("01_stable_follow_player")
-        result = process_fixture(vector)
+        result = _processed("01_stable_follow_player")
         
         assert result["controls"]["arrangement"]["density_target"] == "medium"
     
     def test_allows_probes_when_stable(self):
-        vector = load_vector("01_stable_follow_player")
-        result = process_fixture(vector)
+        result = _processed("01_stable_follow_player")
         
         assert result["controls"]["change_policy"]["allow_density_probes"] is True
 
+    def test_windows_do_not_share_controls(self):
+        vector = load_vector("01_stable_follow_player")
+        first = process_fixture(vector)
+        first["controls"]["feel"]["grid"] = "mutated"
+        second = process_fixture(vector)
+
+        assert second["controls"]["feel"]["grid"] == vector["engine_context"]["grid"]
+        assert second["rationale"]["trigger"] == "stable_baseline"
+
+    @pytest.mark.parametrize("vector_name", [
+        "01_stable_follow_player",
+        "02_unstable_reduce_density_micro_loop",
+        "03_recovery_exit_loop",
+        "04_missing_tempo_freeze_conservative",
+    ])
+    def test_controls_are_independent_at_every_depth(self, vector_name: str):
+        # one vector per policy branch; overwrite every leaf of the output,
+        # however deep, and a later window must still get pristine controls
+        vector = load_vector(vector_name)
+        first = process_fixture(vector)
+        expected = copy.deepcopy(first["controls"])
+        _scribble(first["controls"])
+
+        assert process_fixture(vector)["controls"] == expected
+
 
 class TestVector03Recovery:
     """Vector 03: Recovery from instability → de-escalate assist."""
     
     def test_restores_density_on_recovery(self):
-        vector = load_vector("03_recovery_exit_loop")
-        result = process_fixture(vector)
+        result = _processed("03_recovery_exit_loop")
         
         assert result["controls"]["arrangement"]["density_target"] == "medium"
     
     def test_uses_standard_assist_on_recovery(self):
-        vector = load_vector("03_recovery_exit_loop")
-        result = process_fixture(vector)
+        result = _processed("03_recovery_exit_loop")
         
         assert result["controls"]["assist"]["assist_policy"] == "standard"
     
     def test_allows_probes_on_recovery(self):
-        vector = load_vector("03_recovery_exit_loop")
-        result = process_fixture(vector)
+        result = _processed("03_recovery_exit_loop")
         
         assert result["controls"]["change_policy"]["allow_density_probes"] is True
 
@@ -140,15 +202,13 @@ class TestVector05ProbeAB:
     """Vector 05: Probe A/B — probe only when stable, revert if hurts."""
     
     def test_allows_probes_in_stable_window(self):
-        vector = load_vector("05_probe_density_ab")
-        results = process_multi_window_fixture(vector)
+        results = _processed("05_probe_density_ab")
         
         window_a = results[0]
         assert window_a["controls"]["change_policy"]["allow_density_probes"] is True
     
     def test_reverts_and_disables_probes_when_hurts(self):
-        vector = load_vector("05_probe_density_ab")
-        results = process_multi_window_fixture(vector)
+        results = _processed("05_probe_density_ab")
         
         window_b = results[1]
         # When probe hurts, should revert to sparse and disable probes
@@ -156,58 +216,146 @@ class TestVector05ProbeAB:
         assert window_b["controls"]["change_policy"]["allow_density_probes"] is False
 
 
+class TestPerformanceEventDecode:
+    """Batch decoding must match per-event from_dict."""
+
+    def test_batch_from_dicts_matches_from_dict(self):
+        raw = load_vector("01_stable_follow_player")["events"]
+
+        assert PerformanceEvent.batch_from_dicts(raw) == [PerformanceEvent.from_dict(e) for e in raw]
+
+    def test_batch_from_dicts_rejects_unknown_event_type(self):
+        with pytest.raises(ValueError):
+            PerformanceEvent.batch_from_dicts(
+                [{"t_onset_ms": 0, "event_type": "bogus", "strength": 1.0, "confidence": 1.0}]
+            )
+
+
+def _events(onsets) -> list:
+    """Same-shaped note onsets at the given times, in the given order."""
+    return [PerformanceEvent.from_dict(
+        {"t_onset_ms": t, "event_type": "note_onset", "strength": 0.8, "confidence": 0.9}
+    ) for t in onsets]
+
+
+class TestWindowStats:
+    """compute_window_stats on hand-built windows."""
+
+    def test_interval_variance_matches_sample_variance(self):
+        onsets = [0, 240, 510, 730, 1000, 1260, 1490, 1750, 2010, 2240, 2500, 2770, 3000]
+        events = _events(reversed(onsets))
+        intervals = [b - a for a, b in zip(onsets, onsets[1:])]
+
+        stats = compute_window_stats(events)
+        assert stats.event_count == len(onsets)
+        # integer onsets: exact, not just close
+        assert stats.onset_interval_variance_ms == statistics.variance(intervals)
+
+    def test_caller_event_order_is_untouched(self):
+        # onsets are sorted as a private int list; the events list is never reordered
+        events = _events([900, 100, 500, 300, 700])
+        before = list(events)
+
+        compute_window_stats(events)
+        assert events == before
+
+    def test_columns_match_events(self):
+        raw = load_vector("01_stable_follow_player")["events"]
+        onsets = [e["t_onset_ms"] for e in reversed(raw)]
+        confidences = [e["confidence"] for e in reversed(raw)]
+        before = list(onsets)
+
+        stats = window_stats_from_columns(onsets, confidences)
+        expected = compute_window_stats(PerformanceEvent.batch_from_dicts(raw))
+        assert stats.event_count == expected.event_count
+        assert stats.is_stable is expected.is_stable
+        # reversed order sums the confidences differently; allow float rounding
+        assert stats.window_confidence == pytest.approx(expected.window_confidence)
+        assert stats.onset_interval_variance_ms == pytest.approx(expected.onset_interval_variance_ms)
+        assert onsets == before
+
+    def test_float_epoch_onsets_are_coerced_like_events(self):
+        # float epoch-ms onsets: the integer kernel would cancel badly on them
+        base = 1.7e9
+        onsets = [base + 333.3333 * i for i in range(152)]
+        confidences = [0.9] * len(onsets)
+
+        stats = window_stats_from_columns(onsets, confidences)
+        assert stats.onset_interval_variance_ms >= 0.0
+        assert stats == compute_window_stats(_events(onsets))
+
+    def test_columns_must_be_the_same_length(self):
+        with pytest.raises(ValueError):
+            window_stats_from_columns([0, 250, 500], [0.9, 0.9])
+
+    def test_import_does_not_pull_in_statistics(self):
+        # window_eval keeps its own variance kernel; statistics drags in
+        # fractions/decimal on a cold start
+        code = (
+            "import sys, sg_groove; "
+            "print(sorted({'statistics', 'fractions', 'decimal'} & set(sys.modules)))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "[]"
+
+    def test_presorted_columns_match_sorting_path(self):
+        onsets = [0, 240, 510, 730, 1000, 1260, 1490, 1750, 2010, 2240, 2500, 2770, 3000]
+        confidences = [0.9] * len(onsets)
+
+        assert window_stats_from_columns(onsets, confidences, onsets_sorted=True) == \
+            window_stats_from_columns(list(reversed(onsets)), confidences)
+
+    def test_quiet_window_skips_variance(self):
+        stats = compute_window_stats(_events(range(0, 1000, 250)))
+        assert stats.is_stable is False
+        assert stats.onset_interval_variance_ms == float("inf")
+
+
 class TestAcceptanceAssertions:
     """Run all machine-checkable assertions from assertions.json."""
     
-    def test_all_assertions(self):
-        assertions = load_assertions()
-        
-        for assertion in assertions["v0_assertions"]:
-            name = assertion["name"]
-            when = assertion["when"]
-            vector_name = when["vector"]
-            
-            # Load and process vector
-            vector = load_vector(vector_name)
-            
-            if "windows" in vector:
-                results = process_multi_window_fixture(vector)
-                if "window" in when:
-                    # Find specific window by label
-                    label = when["window"]
-                    result = next(r for r in results if r.get("_label") == label)
-                else:
-                    result = results[0]
+    @pytest.mark.parametrize(
+        "assertion", load_assertions()["v0_assertions"], ids=lambda a: a["name"]
+    )
+    def test_assertion(self, assertion: dict):
+        name = assertion["name"]
+        when = assertion["when"]
+        vector_name = when["vector"]
+        
+        # Load and process vector (once per vector, shared across assertions)
+        vector = load_vector(vector_name)
+        
+        if "windows" in vector:
+            results = _processed(vector_name)
+            if "window" in when:
+                # Find specific window by label
+                label = when["window"]
+                result = next(r for r in results if r.get("_label") == label)
             else:
-                result = process_fixture(vector)
-            
-            # Check expectations
-            if "expect" in assertion:
-                for path, expected in assertion["expect"].items():
+                result = results[0]
+        else:
+            result = _processed(vector_name)
+        
+        # Check expectations
+        if "expect" in assertion:
+            for path, expected in assertion["expect"].items():
+                actual = self._get_nested(result, path)
+                assert actual == expected, f"{name}: {path} expected {expected}, got {actual}"
+        
+        if "expect_any" in assertion:
+            matched = False
+            for option in assertion["expect_any"]:
+                all_match = True
+                for path, expected in option.items():
                     actual = self._get_nested(result, path)
-                    assert actual == expected, f"{name}: {path} expected {expected}, got {actual}"
-            
-            if "expect_any" in assertion:
-                matched = False
-                for option in assertion["expect_any"]:
-                    all_match = True
-                    for path, expected in option.items():
-                        actual = self._get_nested(result, path)
-                        if actual != expected:
-                            all_match = False
-                            break
-                    if all_match:
-                        matched = True
+                    if actual != expected:
+                        all_match = False
                         break
-                assert matched, f"{name}: none of expect_any options matched"
-    
+                if all_match:
+                    matched = True
+                    break
+            assert matched, f"{name}: none of expect_any options matched"
+
     def _get_nested(self, obj: dict, path: str):
         """Get nested value from dict using dot notation."""
-        parts = path.split(".")
-        current = obj
-        for part in parts:
-            if isinstance(current, dict):
-                current = current.get(part)
-            else:
-                return None
-        return current
+        return _compile_path(path)(obj)
@@ -0,0 +1,21 @@
+import json
+
+
+def test_nonfinite_floats_are_written_as_null(json_backend):
+    text = json_backend.dumps({"p95": float("nan"), "hi": [float("inf"), -float("inf")], "ok": 1.5})
+    assert json.loads(text) == {"p95": None, "hi": [None, None], "ok": 1.5}
+
+
+def test_non_str_keys_are_stringified(json_backend):
+    assert json_backend.loads(json_backend.dumps({"error_by_step": {1: 20.0}})) == {"error_by_step": {"1": 20.0}}
+
+
+def test_ints_past_64_bits_round_trip_exactly(json_backend):
+    big = {"a": 2**70, "b": -(2**63) - 1, "c": 2**64 - 1}
+    assert json_backend.loads(json_backend.dumps(big)) == big
+    assert json_backend.loads(b'{"n": 18446744073709551616}') == {"n": 2**64}
+
+
+def test_loads_accepts_what_json_loads_accepts(json_backend):
+    for raw in (b"[NaN, Infinity]", b'\xef\xbb\xbf{"a": 1}', '{"a": 1}'.encode("utf-16")):
+        assert repr(json_backend.loads(raw)) == repr(json.loads(raw))
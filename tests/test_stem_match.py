@@ -9,18 +9,23 @@ Validates:
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 import pytest
 
 
+@lru_cache(maxsize=512)
+def _compile_stem(stem: str) -> "re.Pattern[str]":
+    return re.compile(rf"(?<![A-Za-z0-9_]){re.escape(stem)}(?![A-Za-z0-9_])")
+
+
 def stem_mentioned(text: str, stem: str) -> bool:
     """Check if stem appears as a whole token (not partial match)."""
-    pat = re.compile(rf"(?<![A-Za-z0-9_]){re.escape(stem)}(?![A-Za-z0-9_])")
-    return pat.search(text) is not None
+    return _compile_stem(stem).search(text) is not None
 
 
 def extract_added_lines(diff: str) -> str:
-    """Extract only added lines from a unified diff (like the CI gate does)."""
+    """Extract only added lines from a unified diff (same rule as the CI gate's _iter_added_lines)."""
     return "\n".join(
         ln[1:] for ln in diff.splitlines()
         if ln.startswith("+") and not ln.startswith("+++ ")